@@ -0,0 +1,20 @@
+import streamlit as st
+
+from deciphering.layout import show_banner
+
+# Banner
+show_banner()
+# Content
+st.subheader("About This Project")
+st.markdown("""
+**Deciphering Central Banks** is an innovative project aimed at using natural language processing (NLP) to analyze communications from central banks and other financial institutions.
+
+By detecting sentiment and identifying agent words in various texts, we hope to better understand the narratives and insights provided by these institutions.
+
+This tool was developed by the following Le Wagon students:
+
+- Sasha Bessarabova  
+- Sergio Suarez  
+- Hugo Rao  
+- Sébastien Barbieux
+""")
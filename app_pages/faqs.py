@@ -0,0 +1,24 @@
+import streamlit as st
+
+from deciphering.layout import show_banner
+
+# Banner
+show_banner()
+# Content
+st.subheader("Frequently Asked Questions")
+st.markdown("""
+**Q: What is Sentiment Analysis?**  
+A: Sentiment Analysis determines the emotional tone behind a body of text, helping to understand opinions, attitudes, and emotions.
+
+**Q: What are Economic Agents?**  
+A: Economic agents are entities that play an active role in the macroeconomic processes, and are all affected by the central bank monetary policy. We categorise them into households, firms, the financial sector, governments and central banks.
+
+**Q: What kind of text or URL can I input?**  
+A: You can input any text or URL that contains data related to central banks, financial markets, economic analysis, or similar topics.
+
+**Q: How is the sentiment score calculated?**  
+A: The sentiment score is calculated based on the analysis of text fragments using natural language processing algorithms.
+
+**Q: Can I analyze documents in languages other than English?**  
+A: Currently, the analysis is optimized for English text. Support for other languages may be added in future versions.
+""")
@@ -0,0 +1,46 @@
+import hashlib
+
+import streamlit as st
+
+from deciphering.layout import show_banner
+from deciphering.services import get_result_store, load_archived
+from deciphering.views import show_cache_counters, show_export_buttons, show_result_table, show_summary
+
+result_store = get_result_store()
+
+# Banner
+show_banner()
+# Content
+st.subheader("Analysis History")
+if result_store is None:
+    st.info("The local archive is disabled. Set DCB_ARCHIVE_DIR to enable it.")
+else:
+    source_col, date_col, title_col = st.columns(3)
+    sources = source_col.multiselect("Source:", result_store.sources())
+    date_range = date_col.date_input("Publication date:", value=())
+    title_filter = title_col.text_input("Title contains:")
+    since = date_range[0] if len(date_range) > 0 else None
+    until = date_range[1] if len(date_range) > 1 else since
+
+    documents = result_store.list_documents(sources=sources, since=since, until=until, title=title_filter)
+    if documents.empty:
+        st.info("No archived analyses match these filters.")
+    else:
+        st.dataframe(documents.drop(columns="id"), hide_index=True)
+        document_ids = list(documents["id"])
+        st.caption(f"Export all {int(documents['sentences'].sum()):,} sentences of these {len(document_ids)} analyses:")
+        show_export_buttons(
+            "history:" + hashlib.sha256(",".join(document_ids).encode()).hexdigest(),
+            lambda: result_store.read_documents(document_ids),
+            "history",
+        )
+        labels = {
+            row.id: f"{row.date} · {row.source} · {row.title}" for row in documents.itertuples(index=False)
+        }
+        selected = st.selectbox("Open analysis:", list(labels), format_func=labels.get)
+        df = load_archived(selected)
+        st.markdown("### Analysis Results")
+        show_result_table(df, f"archive:{selected}")
+        show_summary(df, f"archive:{selected}")
+
+show_cache_counters()
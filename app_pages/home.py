@@ -0,0 +1,361 @@
+import datetime
+import hashlib
+import logging
+
+import streamlit as st
+
+from deciphering import config
+from deciphering.batch import merge_results, run_batch
+from deciphering.cache import canonical_url, rows_key, text_key, url_key
+from deciphering.extract import extract_text
+from deciphering.jobs import finish_job, is_finished, job_age, job_gone, wait_for_job
+from deciphering.layout import show_banner
+from deciphering.metrics import METRICS, stage, trace
+from deciphering.results import rows_to_frame
+from deciphering.services import (
+    analyze_text,
+    analyze_url,
+    archive,
+    get_client,
+    get_result_cache,
+    get_result_store,
+    iter_analyze_text,
+    iter_analyze_url,
+    load_archived,
+)
+from deciphering.store import source_from_url
+from deciphering.views import (
+    show_cache_counters,
+    show_debug_panel,
+    show_result_table,
+    show_streamed_results,
+    show_summary,
+)
+
+logger = logging.getLogger(__name__)
+
+client = get_client()
+result_cache = get_result_cache()
+result_store = get_result_store()
+
+
+# Background URL jobs, kept in the session and in the archive index
+def pending_jobs():
+    if "jobs" not in st.session_state:
+        stored = result_store.list_jobs() if result_store is not None else []
+        st.session_state["jobs"] = {job["id"]: job for job in stored}
+    return st.session_state["jobs"]
+
+
+def submit_job(url, source, date):
+    job_id = client.submit_url_job(url)
+    pending_jobs()[job_id] = {
+        "id": job_id, "url": url, "source": source, "date": date.isoformat(), "status": "queued",
+        "submitted_at": datetime.datetime.now().isoformat(timespec="seconds"),
+    }
+    if result_store is not None:
+        result_store.save_job(job_id, url, source, date)
+    return job_id
+
+
+def claim_job(job_id):
+    """Whether this session collects a finished job; every session sees the pending jobs of the archive."""
+    if result_store is None or result_store.claim_job(job_id):
+        return True
+    # Another session is collecting it: it will show up in History
+    pending_jobs().pop(job_id, None)
+    return False
+
+
+def give_up_job(job_id, error):
+    pending_jobs().pop(job_id, None)
+    if result_store is not None:
+        result_store.update_job(job_id, "failed", error=error)
+
+
+def collect_job(job_id, status):
+    """Cache and archive the result of a claimed, finished job, or record its failure.
+
+    If the result cannot be fetched the error propagates and the job stays pending.
+    """
+    job = pending_jobs()[job_id]
+
+    def save(rows):
+        if rows != []:
+            result_cache.put(url_key(job["url"]), rows)
+        return archive(
+            rows_to_frame(rows), rows_key(rows), job["url"], "url", job["source"],
+            datetime.date.fromisoformat(job["date"]), url=job["url"],
+        )
+
+    try:
+        rows = finish_job(client, job_id, status, store=result_store, save=save)
+    except Exception:
+        if result_store is not None:
+            # Release the claim, for the next poll
+            result_store.update_job(job_id, "queued")
+        raise
+    pending_jobs().pop(job_id)
+    return rows
+
+
+# Latest publications scored in the background by the watch-list monitor,
+# refreshed without a rerun
+@st.fragment(run_every=config.LATEST_REFRESH_SECONDS)
+def latest_panel():
+    latest = result_store.list_documents(kind="watch", limit=config.LATEST_COUNT)
+    if latest.empty:
+        return
+    st.subheader("Latest Publications")
+    st.dataframe(latest.drop(columns=["id", "kind"]), hide_index=True)
+    labels = {row.id: f"{row.date} · {row.source} · {row.title}" for row in latest.itertuples(index=False)}
+    selected = st.selectbox("Open publication:", list(labels), format_func=labels.get)
+    df = load_archived(selected)
+    show_summary(df, f"archive:{selected}")
+    with st.expander("Sentences"):
+        show_result_table(df, f"archive:{selected}")
+
+
+@st.fragment(run_every=config.JOB_REFRESH_SECONDS)
+def jobs_panel():
+    jobs = pending_jobs()
+    if not jobs:
+        return
+    st.markdown("#### Background jobs")
+    for job_id, job in list(jobs.items()):
+        if job_age(job) > config.JOB_MAX_AGE_SECONDS:
+            give_up_job(job_id, "No result in time.")
+            st.error(f"Error: {job['url']}: no result after {config.JOB_MAX_AGE_SECONDS / 3600:g} hours, gave up.")
+            continue
+        try:
+            status = client.job_status(job_id)
+        except Exception as e:
+            if job_gone(e):
+                give_up_job(job_id, "The backend no longer knows this job.")
+                st.error(f"Error: {job['url']}: the backend no longer knows this job (it may have restarted).")
+            else:
+                st.warning(f"{job['url']}: could not get the job status ({str(e)})")
+            continue
+        if not is_finished(status):
+            st.progress(status.get("progress") or 0.0, text=f"{job['url']}: {status['status']}")
+            continue
+        if not claim_job(job_id):
+            continue
+        try:
+            rows = collect_job(job_id, status)
+        except Exception as e:
+            st.warning(f"{job['url']}: could not get the job result ({str(e)})")
+            continue
+        if rows is None:
+            st.error(f"Error: {job['url']}: {status.get('error') or 'the job failed.'}")
+        elif rows == []:
+            st.warning(f"{job['url']}: Text is not significant.")
+        else:
+            st.success(f"{job['url']}: analysis finished. It is now in History.")
+
+
+# Input controls and results; interacting with them reruns only this fragment
+@st.fragment
+def analysis_panel():
+    # Users choice of input
+    st.subheader("Input for Analysis")
+    input_type = st.radio("Choose input type:", ("Text", "URL", "Batch"))
+
+    user_input = None
+    if input_type == "Text":
+        user_input = st.text_area("Paste the text you want to analyze:", height=200)
+    elif input_type == "URL":
+        user_input = st.text_input("Paste the URL you want to analyze:")
+        run_as_job = config.URL_JOBS and st.checkbox(
+            "Run as a background job", value=True,
+            help="For long documents: the backend works on the page while you leave this one.",
+        )
+    else:
+        uploaded_files = st.file_uploader(
+            "Upload the documents you want to analyze:",
+            type=["txt", "pdf", "html", "htm"],
+            accept_multiple_files=True,
+        )
+        url_list = st.text_area("And/or paste URLs, one per line:", height=100)
+        concurrency = st.number_input(
+            "Concurrent requests:", min_value=1, max_value=32, value=config.BATCH_CONCURRENCY
+        )
+        user_input = uploaded_files or url_list.strip()
+
+    with st.expander("Archive details"):
+        archive_source = st.text_input(
+            "Source:", placeholder="e.g. ECB, Fed. Defaults to the URL's domain, or 'text' for pasted text."
+        ).strip()
+        archive_date = st.date_input("Publication date:", value=datetime.date.today())
+
+    # Analyse button
+    if st.button("Analyze"):
+        if user_input:
+            # Send request to the API
+            try:
+                with trace(input_type.lower()) as analysis_trace:
+                    # Kept even if the analysis fails, for the timing panel
+                    st.session_state["last_trace"] = analysis_trace
+                    if input_type == "Text":
+                        df, _ = show_streamed_results(iter_analyze_text(user_input), text_key(user_input))
+                        show_summary(df, text_key(user_input), remember=True)
+                        title = " ".join(user_input.split())[:80]
+                        archive(df, text_key(user_input), title, "text", archive_source or "text", archive_date)
+
+                    elif input_type == "URL" and result_store is not None and (
+                        watched_id := result_store.latest_watched(canonical_url(user_input))
+                    ):
+                        # Followed by the monitor: its latest result is already in the archive
+                        st.caption("Latest version scored by the watch-list monitor.")
+                        df = load_archived(watched_id)
+                        st.markdown("### Analysis Results")
+                        show_result_table(df, f"archive:{watched_id}")
+                        show_summary(df, f"archive:{watched_id}", remember=True)
+
+                    elif input_type == "URL" and run_as_job and result_cache.get(url_key(user_input)) is None:
+                        url = user_input.strip()
+                        job_id = submit_job(url, archive_source or source_from_url(url), archive_date)
+                        progress = st.progress(0.0, text="Job queued...")
+                        status = wait_for_job(
+                            client,
+                            job_id,
+                            timeout=config.JOB_WAIT_SECONDS,
+                            long_poll=config.JOB_LONG_POLL_SECONDS,
+                            on_status=lambda status: progress.progress(
+                                status.get("progress") or 0.0, text=f"Job {status['status']}..."
+                            ),
+                        )
+                        if is_finished(status) and claim_job(job_id):
+                            progress.empty()
+                            rows = collect_job(job_id, status)
+                            if rows is None:
+                                st.error(f"Error: {status.get('error') or 'the job failed.'}")
+                            else:
+                                df, result_key = show_streamed_results([rows])
+                                show_summary(df, result_key, remember=True)
+                        elif is_finished(status):
+                            progress.empty()
+                            st.info("Another session is collecting this job; its results will show up in History.")
+                        else:
+                            st.info("Still running. You can leave this page: the job keeps going and its results "
+                                    "will show up under Background jobs and in History.")
+
+                    elif input_type == "URL":
+                        # Keyed by what was scored: the page behind the URL may have changed
+                        df, result_key = show_streamed_results(iter_analyze_url(user_input))
+                        show_summary(df, result_key, remember=True)
+                        archive(
+                            df, result_key, user_input.strip(), "url",
+                            archive_source or source_from_url(user_input), archive_date, url=user_input.strip(),
+                        )
+
+                    elif input_type == "Batch":
+                        documents = []
+
+                        def add_document(name, document):
+                            # Two uploads with the same file name stay two documents
+                            taken = {name for name, _ in documents}
+                            unique, copy = name, 1
+                            while unique in taken:
+                                copy += 1
+                                unique = f"{name} ({copy})"
+                            documents.append((unique, document))
+
+                        for uploaded_file in uploaded_files or []:
+                            try:
+                                with stage("parse"):
+                                    text = extract_text(uploaded_file.name, uploaded_file.getvalue())
+                            except Exception as e:
+                                st.error(f"Error: {uploaded_file.name}: {str(e)}")
+                                continue
+                            add_document(uploaded_file.name, ("text", text))
+                        for url in url_list.splitlines():
+                            if url.strip():
+                                add_document(url.strip(), ("url", url.strip()))
+                        kinds = {name: document for name, document in documents}
+
+                        def analyze_document(document):
+                            kind, value = document
+                            return analyze_text(value) if kind == "text" else analyze_url(value)
+
+                        # Fan the documents out, reporting each one as it completes
+                        results = {name: None for name, _ in documents}
+                        progress = st.progress(0.0, text=f"Analyzing {len(documents)} documents...")
+                        done = 0
+                        for name, rows, error in run_batch(documents, analyze_document, max_workers=int(concurrency)):
+                            done += 1
+                            progress.progress(done / len(documents), text=f"{done}/{len(documents)} done: {name}")
+                            if error is not None:
+                                st.error(f"Error: {name}: {str(error)}")
+                            elif rows == []:
+                                st.warning(f"{name}: Text is not significant.")
+                            else:
+                                kind, value = kinds[name]
+                                if kind == "text":
+                                    archive(
+                                        rows_to_frame(rows), text_key(value), name, "text",
+                                        archive_source or "upload", archive_date,
+                                    )
+                                else:
+                                    archive(
+                                        rows_to_frame(rows), rows_key(rows), name, "url",
+                                        archive_source or source_from_url(value), archive_date, url=value,
+                                    )
+                            results[name] = rows
+
+                        with stage("frame build"):
+                            df = merge_results(results)
+                        if not df.empty:
+                            # Display table of results
+                            st.markdown("### Analysis Results")
+                            # Keyed by what is shown: the documents that returned rows, under their names
+                            batch_key = "batch:" + hashlib.sha256("\n".join(
+                                f"{name}\t{text_key(value) if kind == 'text' else rows_key(results[name])}"
+                                for name, (kind, value) in kinds.items() if results[name]
+                            ).encode()).hexdigest()
+                            show_result_table(df, batch_key)
+                            show_summary(df, batch_key, remember=True)
+                    else:
+                        st.error("Error: Could not retrieve results from the API.")
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+            if config.METRICS_FILE:
+                # Metrics are a side channel: failing to write them must not fail the analysis
+                try:
+                    METRICS.write_file(config.METRICS_FILE)
+                except Exception:
+                    logger.exception("Could not write the metrics file %s", config.METRICS_FILE)
+        else:
+            st.warning("Please input some text or a URL for analysis.")
+    elif "last_result" in st.session_state:
+        last_key, last_df = st.session_state["last_result"]
+        st.markdown("### Analysis Results")
+        show_result_table(last_df, last_key)
+        show_summary(last_df, last_key)
+
+    if config.DEBUG_PANEL:
+        show_debug_panel()
+    # Written to the sidebar from here, so an analysis (a fragment rerun) updates them
+    show_cache_counters()
+
+
+# Banner
+show_banner("Header image not found. Please make sure the image is in the correct path.")
+
+# Title and Description
+st.markdown("<h1 class='title'>Deciphering Central Banks</h1>", unsafe_allow_html=True)
+st.markdown("<p class='description'>Tool for Sentiment and Economic Agent Detection</p>", unsafe_allow_html=True)
+
+st.markdown("""
+Welcome to the **Deciphering Central Banks** tool!  
+This app allows you to input text or a URL to run **Sentiment Analysis** and **Economic Agent Detection**.
+The sentiment is split into positive and negative and the economic agents are categorised into households, firms, the financial sector, governments and central banks.
+""")
+
+if result_store is not None:
+    latest_panel()
+analysis_panel()
+# Polls every few seconds, so only mounted when jobs can be submitted or some
+# from earlier sessions are still pending
+if config.URL_JOBS or (config.BACKEND == "remote" and pending_jobs()):
+    jobs_panel()
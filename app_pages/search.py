@@ -0,0 +1,82 @@
+import hashlib
+
+import streamlit as st
+
+from deciphering import config
+from deciphering.layout import show_banner
+from deciphering.search import FACETS
+from deciphering.services import get_result_store, get_search_index
+from deciphering.views import show_cache_counters, show_result_table
+
+result_store = get_result_store()
+search_index = get_search_index()
+
+
+# Results and facet counts per query; the number of indexed sentences in the
+# key drops the cached copies as soon as new documents are indexed
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_results(version, query):
+    return search_index.search(limit=config.SEARCH_LIMIT, **dict(query))
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_facets(version, query):
+    return search_index.facets(limit=config.SEARCH_FACET_LIMIT, **dict(query))
+
+
+# Banner
+show_banner()
+# Content
+st.subheader("Search Sentences")
+if search_index is None:
+    st.info("The local archive is disabled. Set DCB_ARCHIVE_DIR to enable it.")
+else:
+    with st.spinner("Indexing new analyses..."):
+        search_index.sync(result_store)
+    stats = search_index.stats()
+
+    text = st.text_input(
+        "Search:", placeholder='Words to match, e.g. housing credit; end a word with * to match prefixes (export*)'
+    )
+    agent_col, sentiment_col, source_col, date_col = st.columns(4)
+    agents = agent_col.multiselect("Economic agent:", search_index.values("Agent"))
+    sentiments = sentiment_col.multiselect("Sentiment:", search_index.values("Sentiment"))
+    sources = source_col.multiselect("Bank / source:", search_index.values("Source"))
+    date_range = date_col.date_input("Publication date:", value=())
+    agent_probability_col, sentiment_probability_col = st.columns(2)
+    agent_probability = agent_probability_col.slider("Agent probability:", 0.0, 1.0, (0.0, 1.0), step=0.05)
+    sentiment_probability = sentiment_probability_col.slider("Sentiment probability:", 0.0, 1.0, (0.0, 1.0), step=0.05)
+
+    query = (
+        ("text", text.strip()),
+        ("agents", tuple(agents)),
+        ("sentiments", tuple(sentiments)),
+        ("sources", tuple(sources)),
+        ("since", date_range[0] if len(date_range) > 0 else None),
+        ("until", date_range[1] if len(date_range) > 1 else None),
+        ("agent_probability", agent_probability),
+        ("sentiment_probability", sentiment_probability),
+    )
+    df = get_results(stats["sentences"], query)
+    counts, complete = get_facets(stats["sentences"], query)
+
+    total = int(counts["Agent"].sum())
+    if not complete:
+        st.caption(f"Counts over the newest {config.SEARCH_FACET_LIMIT:,} sentences matching the text")
+    else:
+        st.caption(f"{total:,} of {stats['sentences']:,} indexed sentences match")
+    if total:
+        for name, column in zip(FACETS, st.columns(len(FACETS))):
+            column.markdown(f"**{name}**")
+            column.bar_chart(counts[name], horizontal=True, height=200)
+
+    if df.empty:
+        st.info("No archived sentences match this search.")
+    else:
+        if len(df) < total:
+            st.caption(
+                f"Showing the first {len(df):,} matches, " + ("best first" if text.strip() else "newest first")
+            )
+        show_result_table(df, "search:" + hashlib.sha256(repr((stats["sentences"], query)).encode()).hexdigest())
+
+show_cache_counters()
@@ -0,0 +1,96 @@
+import datetime
+
+import streamlit as st
+
+from deciphering.layout import show_banner
+from deciphering.services import get_result_store
+from deciphering.timeseries import GROUPINGS, align_to_events, sentiment_index
+from deciphering.views import show_cache_counters
+
+result_store = get_result_store()
+
+
+# Daily rollups matching the filters; the rollup version in the key drops the
+# cached copy as soon as a new document lands
+@st.cache_data(max_entries=32, show_spinner=False)
+def get_daily(version, sources, agents, since, until):
+    return result_store.daily_sentiment(sources=list(sources), agents=list(agents), since=since, until=until)
+
+
+def parse_events(text):
+    """Dates from lines starting with ``YYYY-MM-DD`` (anything after it is a label)."""
+    dates = []
+    for line in text.splitlines():
+        if line.strip():
+            try:
+                dates.append(datetime.date.fromisoformat(line.split()[0]))
+            except ValueError:
+                st.warning(f"Not a date, skipped: {line.strip()}")
+    return dates
+
+
+# Banner
+show_banner()
+# Content
+st.subheader("Sentiment Over Time")
+if result_store is None:
+    st.info("The local archive is disabled. Set DCB_ARCHIVE_DIR to enable it.")
+else:
+    with st.spinner("Adding older analyses to the daily rollups..."):
+        result_store.backfill_rollups()
+    version = result_store.rollup_version()
+
+    source_col, agent_col, date_col = st.columns(3)
+    sources = source_col.multiselect("Bank / source:", result_store.sources())
+    agents = agent_col.multiselect("Economic agent:", result_store.agents())
+    date_range = date_col.date_input("Period:", value=())
+    since = date_range[0] if len(date_range) > 0 else None
+    until = date_range[1] if len(date_range) > 1 else None
+    grouping_col, window_col = st.columns(2)
+    grouping = grouping_col.radio("One line per:", list(GROUPINGS), horizontal=True)
+    window = window_col.slider("Rolling window (days):", min_value=1, max_value=365, value=90)
+
+    # Load the window before the period too, so its first days are complete
+    daily = get_daily(
+        version, tuple(sources), tuple(agents), since and since - datetime.timedelta(days=window - 1), until
+    )
+    if daily.empty:
+        st.info("No archived analyses match these filters.")
+    else:
+        index = sentiment_index(daily, grouping, window)
+        if since:
+            index = index[index.index >= str(since)]
+        st.caption(
+            f"Probability-weighted net sentiment over the previous {window} days (-1 negative, +1 positive), "
+            f"from {int(daily['sentences'].sum()):,} sentences"
+        )
+        st.line_chart(index)
+
+        st.markdown("#### Around Events")
+        events_col, use_col = st.columns([3, 2])
+        events_text = events_col.text_area(
+            "Event dates, one per line (YYYY-MM-DD, optionally followed by a label):",
+            placeholder="2024-09-18 FOMC\n2024-11-07 FOMC",
+        )
+        publication_source = use_col.selectbox(
+            "Or use the publication dates of:", [None, *result_store.sources()],
+            format_func=lambda source: source or "(none)",
+        )
+        before = use_col.number_input("Days before:", min_value=0, max_value=365, value=14)
+        after = use_col.number_input("Days after:", min_value=0, max_value=365, value=14)
+        event_dates = parse_events(events_text)
+        if publication_source:
+            event_dates += sorted(set(daily.loc[daily['source'] == publication_source, 'date']))
+        if event_dates:
+            # Unfiltered by period, so events near its edges keep their whole window
+            profile, used = align_to_events(
+                get_daily(version, tuple(sources), tuple(agents), None, None),
+                event_dates, grouping, int(before), int(after),
+            )
+            if used:
+                st.caption(f"Net sentiment by day relative to the event, pooled over {used} events")
+                st.line_chart(profile)
+            else:
+                st.info("None of these events fall within the archived data.")
+
+show_cache_counters()
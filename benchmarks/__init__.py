@@ -0,0 +1 @@
+"""Benchmarks that run the app's client code against a local stub of the inference API."""
@@ -0,0 +1,102 @@
+"""Image page weight and an estimate of time-to-image for the Home, FAQs and About pages.
+
+Three ways of serving the banner and sidebar logo are compared:
+
+- ``original``: what the app first shipped: full-size PIL images handed to
+  ``st.image``, which re-encodes them (using Streamlit's own helpers),
+- ``resized``: the originals downsized once and cached (``load_image_bytes``),
+- ``variants``: the file a browser picks from the ``<picture>`` srcset built
+  by ``python -m deciphering.assets`` (AVIF when available, else WebP).
+
+There is no headless browser here, so first paint is estimated as transfer
+time at ``--mbps`` plus the time Pillow takes to decode what was downloaded.
+
+    python -m benchmarks.bench_assets --viewport 1440 --dpr 1 2
+"""
+import argparse
+import io
+import os
+import time
+
+from PIL import Image
+
+from deciphering.assets import BUILD_DIR, RESOURCES_DIR, load_image_bytes, read_manifest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Images each page shows: (file, CSS width in px, or None to fill the viewport)
+PAGES = {
+    "Home": [("DALL.E_Banner.jpg", None), ("DALL.E_Logo_NoBKG.png", 120)],
+    "FAQs": [("DALL.E_Banner.jpg", None), ("DALL.E_Logo_NoBKG.png", 120)],
+    "About": [("DALL.E_Banner.jpg", None), ("DALL.E_Logo_NoBKG.png", 120)],
+}
+
+
+def original_bytes(name):
+    """Bytes Streamlit sent for a full-size PIL image passed to st.image."""
+    from streamlit.elements.lib import image_utils
+    from streamlit.elements.lib.layout_utils import LayoutConfig
+
+    image = Image.open(os.path.join(RESOURCES_DIR, name))
+    image_format = image_utils._validate_image_format_string(image, "auto")
+    data = image_utils._pil_to_bytes(image, image_format)
+    return image_utils._ensure_image_size_and_format(data, LayoutConfig(width="stretch"), image_format)
+
+
+def resized_bytes(name, css_width):
+    return load_image_bytes(os.path.join(RESOURCES_DIR, name), 1600 if css_width is None else 2 * css_width)
+
+
+def variant_bytes(name, pixels, manifest):
+    """The file a browser would choose from the srcset: the narrowest variant covering ``pixels``."""
+    variants = manifest.get(name, [])
+    preferred = [v for v in variants if v["format"] == "avif"] or variants
+    if not preferred:
+        return None
+    wide_enough = [v for v in preferred if v["width"] >= pixels] or [max(preferred, key=lambda v: v["width"])]
+    variant = min(wide_enough, key=lambda v: v["width"])
+    with open(os.path.join(BUILD_DIR, variant["file"]), "rb") as f:
+        return f.read()
+
+
+def decode_ms(data):
+    start = time.perf_counter()
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewport", type=int, default=1440, help="viewport width in CSS pixels")
+    parser.add_argument("--dpr", type=float, nargs="+", default=[1, 2], help="device pixel ratios")
+    parser.add_argument("--mbps", type=float, default=10.0, help="link speed for the transfer estimate")
+    args = parser.parse_args()
+    os.chdir(ROOT)
+
+    manifest = read_manifest()
+    if not manifest:
+        print("No pre-built variants; run `make assets` first to include them.")
+    for dpr in args.dpr:
+        print(f"viewport {args.viewport} px @ {dpr:g}x")
+        for page, images in PAGES.items():
+            for strategy in ("original", "resized", "variants"):
+                payloads = []
+                for name, css_width in images:
+                    pixels = int((css_width or args.viewport) * dpr)
+                    if strategy == "original":
+                        payloads.append(original_bytes(name))
+                    elif strategy == "resized":
+                        payloads.append(resized_bytes(name, css_width))
+                    else:
+                        payloads.append(variant_bytes(name, pixels, manifest))
+                if None in payloads:
+                    continue
+                weight = sum(map(len, payloads))
+                transfer_ms = weight * 8 / (args.mbps * 1e6) * 1000
+                paint_ms = transfer_ms + sum(map(decode_ms, payloads))
+                print(f"  {page:<6} {strategy:<9} {weight / 1024:8.0f} KB   est. images painted {paint_ms:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Batch throughput as a function of the concurrency limit.
+
+With a fixed per-request latency on the stub server, documents per second
+should grow close to linearly with ``max_workers`` up to the pool size.
+
+    python -m benchmarks.bench_batch --documents 32 --latency 0.1
+"""
+import argparse
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.batch import run_batch
+from deciphering.client import InferenceClient
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub server latency in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency)
+    client = InferenceClient(server.url, pool_size=max(args.concurrency))
+    documents = [(f"doc-{i}", f"Speech number {i}. Inflation remains elevated.") for i in range(args.documents)]
+    try:
+        baseline = None
+        for workers in args.concurrency:
+            start = time.perf_counter()
+            failures = sum(error is not None for _, _, error in run_batch(documents, client.predict_text, workers))
+            elapsed = time.perf_counter() - start
+            throughput = args.documents / elapsed
+            baseline = baseline or throughput
+            print(
+                f"concurrency {workers:>3}: {throughput:7.1f} docs/s  "
+                f"speed-up {throughput / baseline:5.2f}x  failures {failures}"
+            )
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
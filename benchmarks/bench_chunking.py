@@ -0,0 +1,47 @@
+"""End-to-end latency of one long document, sent whole vs. chunked in parallel.
+
+The stub server's latency grows with the input size, so splitting the
+document into N chunks scored concurrently should cut latency roughly N-fold.
+
+    python -m benchmarks.bench_chunking --kb 400 --latency-per-kb 0.01
+"""
+import argparse
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.chunking import chunk_text, predict_chunked
+from deciphering.client import InferenceClient
+
+SENTENCE = "The Committee judges that the risks to achieving its employment and inflation goals are roughly in balance. "
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--kb", type=int, default=400, help="document size in KB")
+    parser.add_argument("--latency-per-kb", type=float, default=0.01)
+    parser.add_argument("--max-bytes", type=int, default=16384)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    text = SENTENCE * (args.kb * 1024 // len(SENTENCE))
+    server = start_stub_server(latency_per_kb=args.latency_per_kb)
+    client = InferenceClient(server.url, pool_size=max(args.workers))
+    try:
+        start = time.perf_counter()
+        whole = client.predict_text(text)
+        single = time.perf_counter() - start
+        print(f"{len(text) / 1024:.0f} KB, {len(whole)} sentences, {len(chunk_text(text, args.max_bytes))} chunks")
+        print(f"single request   {single:6.2f} s")
+        for workers in args.workers:
+            start = time.perf_counter()
+            rows = predict_chunked(client.predict_text, text, args.max_bytes, workers)
+            elapsed = time.perf_counter() - start
+            assert [row[0] for row in rows] == [row[0] for row in whole], "row order differs"
+            print(f"chunked, {workers:>2} workers {elapsed:6.2f} s  speed-up {single / elapsed:5.2f}x")
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
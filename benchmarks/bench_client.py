@@ -0,0 +1,65 @@
+"""Per-call latency of the pooled ``InferenceClient`` vs. bare ``requests`` calls.
+
+The baseline reproduces what app.py used to do: a module-level
+``requests.post`` per analysis, i.e. a fresh connection every time.
+
+    python -m benchmarks.bench_client --calls 200 --latency 0.005
+"""
+import argparse
+import json
+import statistics
+import time
+
+import requests
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.client import InferenceClient
+
+TEXT = "The Governing Council decided to keep the key interest rates unchanged. " * 20
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+def measure(call, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name, samples):
+    print(
+        f"{name:<10} mean {statistics.mean(samples):7.2f} ms   p50 {percentile(samples, 50):7.2f} ms   "
+        f"p95 {percentile(samples, 95):7.2f} ms   p99 {percentile(samples, 99):7.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server latency in seconds")
+    args = parser.parse_args()
+
+    server = start_stub_server(latency=args.latency)
+    try:
+        def baseline():
+            response = requests.post(server.url + "/predict", json=str(TEXT))
+            json.loads(response.content.decode('utf-8').encode('ascii', 'ignore').decode('ascii'))
+
+        client = InferenceClient(server.url)
+        baseline()
+        client.predict_text(TEXT)
+        report("requests", measure(baseline, args.calls))
+        report("client", measure(lambda: client.predict_text(TEXT), args.calls))
+        client.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Backend calls and latency when many sessions analyse the same documents at once.
+
+A burst of ``--sessions`` simulated users, arriving within ``--spread``
+seconds, each analyse one of ``--documents`` distinct texts through the same
+path as the app (result cache, then the backend). Without coalescing, every
+session that misses the cache calls the backend; with the single-flight
+layer there should be exactly one call per distinct document, and the tail
+latency drops because the stub server (a fixed number of model workers) is
+not flooded with duplicates.
+
+    python -m benchmarks.bench_coalescing --sessions 48 --documents 4
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.cache import ResultCache, text_key
+from deciphering.client import InferenceClient
+from deciphering.singleflight import SingleFlight
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+def run_burst(client, texts, sessions, spread, coalesce):
+    cache = ResultCache()
+    in_flight = SingleFlight()
+    latencies = []
+    lock = threading.Lock()
+
+    def analyze(text):
+        key = text_key(text)
+        rows = cache.get(key)
+        if rows is not None:
+            return rows
+        if not coalesce:
+            rows = client.predict_text(text)
+            cache.put(key, rows)
+            return rows
+
+        def score():
+            rows = client.predict_text(text)
+            cache.put(key, rows)
+            return [rows]
+
+        return [row for rows in in_flight.stream(key, score) for row in rows]
+
+    def session(text, delay):
+        time.sleep(delay)
+        start = time.perf_counter()
+        analyze(text)
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    rng = random.Random(0)
+    threads = [
+        threading.Thread(target=session, args=(rng.choice(texts), rng.uniform(0, spread)))
+        for _ in range(sessions)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=48)
+    parser.add_argument("--documents", type=int, default=4)
+    parser.add_argument("--spread", type=float, default=0.5, help="seconds over which the sessions arrive")
+    parser.add_argument("--latency", type=float, default=0.3, help="stub server latency in seconds")
+    parser.add_argument("--workers", type=int, default=4, help="requests the stub server scores at once")
+    args = parser.parse_args()
+
+    texts = [f"Statement {i}. The Committee decided to keep rates unchanged." for i in range(args.documents)]
+    for coalesce in (False, True):
+        server = start_stub_server(latency=args.latency, concurrency=args.workers)
+        client = InferenceClient(server.url, pool_size=args.sessions)
+        try:
+            latencies = run_burst(client, texts, args.sessions, args.spread, coalesce)
+        finally:
+            client.close()
+            server.shutdown()
+        print(
+            f"{'single-flight' if coalesce else 'no coalescing':<14} "
+            f"backend calls {server.requests:>3} ({server.requests / args.documents:5.2f} per document)  "
+            f"p50 {statistics.median(latencies) * 1000:6.0f} ms  "
+            f"p99 {percentile(latencies, 0.99) * 1000:6.0f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Time and peak memory of turning an API response into a result table.
+
+Compares the original path (decode, ASCII round trip, ``json.loads``,
+``pd.DataFrame`` and positional column names) with ``deciphering.decode``.
+Each measurement runs in a fresh process and reports the growth of its peak
+RSS, which also covers allocations tracemalloc cannot see (Arrow buffers).
+
+    python -m benchmarks.bench_decode --rows 10000 100000
+"""
+import argparse
+import json
+import multiprocessing
+import resource
+import time
+
+import pandas as pd
+
+from deciphering import decode
+from deciphering.decode import loads
+from deciphering.results import rows_to_frame
+
+SENTENCE = "La BCE a relevé ses taux directeurs de 25 points de base, à 4,50 € pour la facilité de prêt marginal."
+
+
+def make_payload(rows):
+    return json.dumps(
+        [[f"{SENTENCE} ({i})", "central bank", 0.87, "negative", 0.64] for i in range(rows)],
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def original(content):
+    result = content.decode('utf-8').encode('ascii', 'ignore').decode('ascii')
+    result = json.loads(result)
+    df = pd.DataFrame(result)
+    df.columns = ['Sentence', 'Agent', 'Agent Probability', 'Sentiment', 'Sentiment Probability']
+    return df
+
+
+def current(content):
+    return rows_to_frame(loads(content))
+
+
+def measure(name, rows, repeat=3):
+    """Run in a child process: best time in ms, peak RSS growth and frame size in MB, Unicode kept."""
+    function = {"original": original, "decode": current}[name]
+    content = make_payload(rows)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df = function(content)
+        best = min(best, time.perf_counter() - start)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    frame_size = df.memory_usage(deep=True).sum() / 2**20
+    return best * 1000, peak / 1024, frame_size, df['Sentence'].iloc[0].startswith(SENTENCE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    args = parser.parse_args()
+    print(f"JSON parser: {'orjson' if decode.orjson is not None else 'json (stdlib)'}")
+    context = multiprocessing.get_context("spawn")
+    for rows in args.rows:
+        print(f"{rows:,} rows, {len(make_payload(rows)) / 2**20:.1f} MB response")
+        for name in ("original", "decode"):
+            with context.Pool(1) as pool:
+                ms, peak, frame_size, intact = pool.apply(measure, (name, rows))
+            print(
+                f"  {name:<9} {ms:8.1f} ms   peak RSS +{peak:7.1f} MB   "
+                f"frame {frame_size:6.1f} MB   unicode intact: {intact}"
+            )
+
+if __name__ == "__main__":
+    main()
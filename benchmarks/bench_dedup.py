@@ -0,0 +1,74 @@
+"""Inference volume and latency for near-duplicate documents, with and without sentence reuse.
+
+The sentence cache is primed with one statement; then variants sharing a
+given share of its sentences are analysed. With the cache, the bytes sent
+and the time spent should shrink in proportion to the overlap.
+
+    python -m benchmarks.bench_dedup --sentences 60 --latency-per-kb 0.2
+"""
+import argparse
+import random
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.cache import ResultCache
+from deciphering.client import InferenceClient
+from deciphering.dedup import iter_deduplicated
+
+
+def statement(sentences, seed):
+    rng = random.Random(seed)
+    subjects = ("Inflation", "Job gains", "Household spending", "Business investment", "The unemployment rate")
+    verbs = ("has eased", "remained elevated", "moderated", "picked up", "stayed low")
+    return [
+        f"{rng.choice(subjects)} {rng.choice(verbs)} over the past {rng.randint(2, 12)} months, "
+        f"according to indicator number {seed * 1000 + i}."
+        for i in range(sentences)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sentences", type=int, default=60)
+    parser.add_argument("--latency-per-kb", type=float, default=0.2, help="stub server seconds per KB of input")
+    parser.add_argument("--overlap", type=float, nargs="+", default=[0.0, 0.5, 0.8, 0.95])
+    args = parser.parse_args()
+
+    server = start_stub_server(latency_per_kb=args.latency_per_kb)
+    client = InferenceClient(server.url)
+    base = statement(args.sentences, seed=0)
+    sent = []
+
+    def predict(text):
+        sent.append(len(text.encode("utf-8")))
+        return [client.predict_text(text)]
+
+    try:
+        for overlap in args.overlap:
+            fresh = statement(args.sentences, seed=int(overlap * 100) + 1)
+            keep = int(round(overlap * args.sentences))
+            variant = " ".join(base[:keep] + fresh[keep:])
+            results = {}
+            for label, use_cache in (("whole text", False), ("new sentences only", True)):
+                cache = ResultCache()
+                list(iter_deduplicated(" ".join(base), cache, predict))
+                sent.clear()
+                start = time.perf_counter()
+                if use_cache:
+                    rows = [row for batch in iter_deduplicated(variant, cache, predict) for row in batch]
+                else:
+                    rows = [row for batch in predict(variant) for row in batch]
+                elapsed = time.perf_counter() - start
+                results[label] = rows
+                print(
+                    f"overlap {overlap:4.0%}  {label:<18} {sum(sent) / 1024:6.1f} KB sent  "
+                    f"{elapsed * 1000:6.0f} ms  hit rate {cache.stats()['hits'] / args.sentences if use_cache else 0:4.0%}"
+                )
+            assert results["whole text"] == results["new sentences only"], "stitched table differs"
+    finally:
+        client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Aggregate throughput across several API replicas, with failures injected.
+
+Each scenario runs the same batch through one client against local stub
+servers: a single replica as the baseline, several identical replicas, one
+replica three times slower than the others (where ``ewma`` should route
+around it) and a faulty set where one replica fails a share of its requests
+and another goes down halfway through. Failover should keep client-side
+failures at zero.
+
+    python -m benchmarks.bench_endpoints --replicas 3 --latency 0.1
+"""
+import argparse
+import threading
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.batch import run_batch
+from deciphering.client import InferenceClient
+
+
+def run_scenario(name, servers, strategy, documents, concurrency, down_after=None):
+    client = InferenceClient(
+        [server.url for server in servers],
+        pool_size=concurrency,
+        retries=2,
+        backoff=0.1,
+        strategy=strategy,
+        cooldown=2.0,
+        health_interval=0.5,
+    )
+    before = [server.requests for server in servers]
+    timer = None
+    if down_after is not None:
+        timer = threading.Timer(down_after, lambda: setattr(servers[-1], "healthy", False))
+        timer.start()
+    start = time.perf_counter()
+    failures = sum(error is not None for _, _, error in run_batch(documents, client.predict_text, concurrency))
+    elapsed = time.perf_counter() - start
+    if timer is not None:
+        timer.cancel()
+    client.close()
+    spread = " ".join(f"{server.requests - count:>4}" for server, count in zip(servers, before))
+    print(
+        f"{name:<28} {strategy:<17} {len(documents) / elapsed:7.1f} docs/s  "
+        f"failures {failures:>3}  requests per replica: {spread}"
+    )
+    return len(documents) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replicas", type=int, default=3)
+    parser.add_argument("--documents", type=int, default=240)
+    parser.add_argument("--concurrency", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.1, help="stub server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="failure share of the faulty replica")
+    args = parser.parse_args()
+
+    documents = [(f"doc-{i}", f"Speech number {i}. Inflation remains elevated.") for i in range(args.documents)]
+    servers = []
+
+    def replicas(latencies, error_rates=None):
+        for server in servers:
+            server.shutdown()
+        servers[:] = [
+            start_stub_server(latency=latency, error_rate=rate, concurrency=1)
+            for latency, rate in zip(latencies, error_rates or [0.0] * len(latencies))
+        ]
+        return servers
+
+    try:
+        baseline = run_scenario("1 replica", replicas([args.latency]), "least_outstanding", documents, args.concurrency)
+        same = [args.latency] * args.replicas
+        slow = [args.latency] * (args.replicas - 1) + [args.latency * 3]
+        for strategy in ("least_outstanding", "ewma"):
+            throughput = run_scenario(
+                f"{args.replicas} replicas", replicas(same), strategy, documents, args.concurrency
+            )
+            print(f"{'':<28} speed-up over 1 replica: {throughput / baseline:.2f}x")
+        for strategy in ("least_outstanding", "ewma"):
+            run_scenario(f"{args.replicas} replicas, 1 slow", replicas(slow), strategy, documents, args.concurrency)
+        rates = [0.0] * args.replicas
+        rates[0] = args.error_rate
+        for strategy in ("least_outstanding", "ewma"):
+            run_scenario(
+                f"{args.replicas} replicas, 1 faulty, 1 down",
+                replicas(same, rates),
+                strategy,
+                documents,
+                args.concurrency,
+                down_after=1.0,
+            )
+    finally:
+        for server in servers:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Export size and time per format, first download vs a repeated one.
+
+The first download writes the result from its Arrow table; repeated ones
+are served from the ``ExportCache``. The pandas ``to_csv`` column is the
+plain CSV an analyst got by converting the frame by hand.
+
+    python -m benchmarks.bench_export --sizes 10000 100000
+"""
+import argparse
+import time
+
+from benchmarks.bench_pager import result
+from deciphering.export import FORMATS, ExportCache
+from deciphering.results import to_arrow
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'format':<12} {'KB':>9} {'first ms':>9} {'cached ms':>10}")
+    for size in args.sizes:
+        df = result(size)
+        csv, csv_ms = timed(lambda: df.to_csv(index=False).encode("utf-8"))
+        print(f"{size:>8,} {'pandas CSV':<12} {len(csv) / 1024:>9,.0f} {csv_ms:>9.1f} {'':>10}")
+        cache = ExportCache()
+        for export_format in FORMATS:
+            data, first_ms = timed(lambda: cache.get(size, export_format, lambda: to_arrow(df)))
+            _, cached_ms = timed(lambda: cache.get(size, export_format, lambda: to_arrow(df)))
+            print(f"{size:>8,} {export_format:<12} {len(data) / 1024:>9,.0f} {first_ms:>9.1f} {cached_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Daily re-analysis of monitored pages, backend fetch vs client fetch with conditional GETs.
+
+A watch list of pages is analysed on three "days": first fetch, nothing
+changed, then a share of the pages revised. Fetched by the backend
+(``/predict_by_url``), every page is downloaded and scored every day. Fetched
+by the app, an unchanged page costs a ``304`` and a result cache hit on its
+text; only revised pages are downloaded, extracted and scored again.
+
+    python -m benchmarks.bench_fetch --pages 20 --sentences 200 --changed 0.1
+"""
+import argparse
+import tempfile
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.cache import ResultCache, text_key
+from deciphering.client import InferenceClient
+from deciphering.fetch import HttpCache, PageFetcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=200, help="sentences per page")
+    parser.add_argument("--changed", type=float, default=0.1, help="share of pages revised on day 3")
+    parser.add_argument("--latency-per-kb", type=float, default=0.02, help="stub server seconds per KB scored")
+    parser.add_argument("--extract-workers", type=int, default=2)
+    args = parser.parse_args()
+
+    server = start_stub_server(latency_per_kb=args.latency_per_kb, url_sentences=args.sentences)
+    client = InferenceClient(server.url)
+    paths = [f"/pages/statement-{i}" for i in range(args.pages)]
+    urls = [server.url + path for path in paths]
+
+    def backend_fetch(url, cache):
+        # The backend cannot tell whether a page changed, so a monitored page
+        # is fetched and scored again every day
+        return client.predict_url(url)
+
+    with tempfile.TemporaryDirectory() as directory:
+        fetcher = PageFetcher(HttpCache(f"{directory}/http.sqlite3"), extract_workers=args.extract_workers)
+
+        def client_fetch(url, cache):
+            text = fetcher.fetch_text(url)
+            rows = cache.get(text_key(text))
+            if rows is None:
+                rows = client.predict_text(text)
+                cache.put(text_key(text), rows)
+            return rows
+
+        print(f"{'mode':<14} {'day':<10} {'s':>6} {'downloads':>10} {'304s':>6} {'scored':>7}")
+        for label, analyze in (("backend fetch", backend_fetch), ("client fetch", client_fetch)):
+            server.page_versions.clear()
+            cache = ResultCache(ttl=0)
+            for day in ("first", "unchanged", "revised"):
+                if day == "revised":
+                    for path in paths[:int(round(args.changed * len(paths)))]:
+                        server.change_page(path)
+                before = (server.requests, server.page_downloads, server.pages_not_modified)
+                start = time.perf_counter()
+                for url in urls:
+                    analyze(url, cache)
+                elapsed = time.perf_counter() - start
+                scored = server.requests - before[0]
+                downloads = server.page_downloads - before[1]
+                not_modified = server.pages_not_modified - before[2]
+                if label == "backend fetch":
+                    # The stub scores /predict_by_url without downloading anything
+                    downloads = scored
+                print(f"{label:<14} {day:<10} {elapsed:>6.2f} {downloads:>10} {not_modified:>6} {scored:>7}")
+        fetcher.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""Load test of the whole app: concurrent simulated users against the stub API.
+
+Each simulated user is a headless AppTest session on the Home page that
+repeatedly pastes a text (or, for ``--url-share`` of its interactions, a
+URL) and clicks Analyze, which exercises the app's real request, parse and
+render path. The stub server's latency, payload size and error rate are
+configurable. Result and sentence caches are off and every input is unique,
+so each click reaches the backend.
+
+Reports throughput, p50/p95/p99 click-to-render latency, failed
+interactions and peak RSS. With ``--max-p95-ms`` or ``--max-error-rate``
+it exits with status 1 when a limit is exceeded, which is how
+``make bench_load`` catches regressions.
+
+    python -m benchmarks.bench_load --users 8 --iterations 5 --latency 0.1
+"""
+import argparse
+import logging
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.stub_server import start_stub_server
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def make_text(user, iteration, sentences):
+    return " ".join(
+        f"User {user} statement {iteration}: inflation indicator {i} moderated over the quarter."
+        for i in range(sentences)
+    )
+
+
+def simulate_user(user, args, latencies, failures, lock):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(user)
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.switch_page("app_pages/home.py").run()
+    for iteration in range(args.iterations):
+        if rng.random() < args.url_share:
+            at.radio[0].set_value("URL").run()
+            at.text_input[0].input(f"https://www.example.org/statements/{user}/{iteration}").run()
+        else:
+            at.radio[0].set_value("Text").run()
+            at.text_area[0].input(make_text(user, iteration, args.sentences)).run()
+        start = time.perf_counter()
+        at.button[0].click().run()
+        elapsed = time.perf_counter() - start
+        failed = bool(at.exception) or any(error.value.startswith("Error") for error in at.error)
+        with lock:
+            latencies.append(elapsed)
+            failures.append(failed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=5, help="analyses per user")
+    parser.add_argument("--sentences", type=int, default=20, help="sentences per pasted text")
+    parser.add_argument("--url-share", type=float, default=0.25, help="share of analyses that use a URL")
+    parser.add_argument("--url-sentences", type=int, default=20, help="sentences on each stub page")
+    parser.add_argument("--latency", type=float, default=0.1, help="stub server seconds per request")
+    parser.add_argument("--latency-per-kb", type=float, default=0.0, help="stub server seconds per KB of text")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stub responses that are 503s")
+    parser.add_argument("--max-p95-ms", type=float, help="fail if the p95 latency is higher")
+    parser.add_argument("--max-error-rate", type=float, help="fail if a larger share of analyses fails")
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    server = start_stub_server(
+        latency=args.latency,
+        latency_per_kb=args.latency_per_kb,
+        error_rate=args.error_rate,
+        url_sentences=args.url_sentences,
+    )
+    archive_dir = tempfile.mkdtemp(prefix="bench_load_")
+    # Read by deciphering.config when the app is first run below.
+    os.environ.update({
+        "DCB_API_URL": server.url,
+        "DCB_CACHE_DB": "",
+        "DCB_CACHE_MAX_ENTRIES": "0",
+        "DCB_SENTENCE_CACHE": "0",
+        "DCB_ARCHIVE_DIR": archive_dir,
+        "DCB_HTTP_RETRY_BACKOFF": "0.05",
+    })
+    os.chdir(ROOT)
+
+    latencies, failures, lock = [], [], threading.Lock()
+    users = [
+        threading.Thread(target=simulate_user, args=(user, args, latencies, failures, lock))
+        for user in range(args.users)
+    ]
+    start = time.perf_counter()
+    for user in users:
+        user.start()
+    for user in users:
+        user.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+
+    if len(latencies) < 2:
+        sys.exit("Not enough analyses completed to compute percentiles.")
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    p50, p95, p99 = (cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000)
+    error_rate = sum(failures) / len(failures)
+    print(f"users {args.users}, analyses {len(latencies)}, backend requests {server.requests}")
+    print(f"throughput     {len(latencies) / elapsed:8.2f} analyses/s")
+    print(f"latency        p50 {p50:7.0f} ms   p95 {p95:7.0f} ms   p99 {p99:7.0f} ms")
+    print(f"failed         {error_rate:8.1%}")
+    print(f"peak RSS       {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:8.0f} MB")
+
+    problems = []
+    if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+        problems.append(f"p95 {p95:.0f} ms is above {args.max_p95_ms:.0f} ms")
+    if args.max_error_rate is not None and error_rate > args.max_error_rate:
+        problems.append(f"{error_rate:.1%} of analyses failed, above {args.max_error_rate:.1%}")
+    if problems:
+        sys.exit("Regression: " + "; ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Watch-list monitor passes over a file-based feed stand-in.
+
+Writes an RSS feed and its HTML publications to a temporary directory (linked
+with ``file://`` URLs), then runs monitor passes against the stub API: the
+first pass scores everything, a pass with nothing changed should score
+nothing, and after one publication is revised and one is added only those two
+are scored (the revised one only for its new sentences).
+
+    python -m benchmarks.bench_monitor --publications 20 --sentences 100
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.cache import ResultCache
+from deciphering.client import InferenceClient
+from deciphering.fetch import HttpCache, PageFetcher
+from deciphering.monitor import Monitor, load_watchlist
+from deciphering.store import ResultStore
+
+
+def write_publication(directory, index, count, revision=0):
+    sentences = [
+        f"Publication {index} finds that inflation eased in month {month} of the year."
+        for month in range(1, count + 1)
+    ]
+    if revision:
+        sentences.append(f"This statement was corrected {revision} times.")
+    path = os.path.join(directory, f"statement-{index}.html")
+    with open(path, "w") as f:
+        f.write(
+            "<html><head><title>Statement</title></head><body><nav>Home | Press</nav><article>"
+            + "".join(f"<p>{sentence}</p>" for sentence in sentences)
+            + "</article></body></html>"
+        )
+    return path
+
+
+def write_feed(directory, count):
+    items = "".join(
+        f"<item><title>Statement {i}</title><link>file://{directory}/statement-{i}.html</link>"
+        f"<pubDate>Mon, {i % 28 + 1:02d} Sep 2025 14:00:00 GMT</pubDate></item>"
+        for i in reversed(range(count))
+    )
+    with open(os.path.join(directory, "feed.xml"), "w") as f:
+        f.write(f"<?xml version='1.0'?><rss version='2.0'><channel><title>Press</title>{items}</channel></rss>")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--publications", type=int, default=20)
+    parser.add_argument("--sentences", type=int, default=100, help="sentences per publication")
+    parser.add_argument("--latency-per-kb", type=float, default=0.02, help="stub server seconds per KB scored")
+    args = parser.parse_args()
+
+    server = start_stub_server(latency_per_kb=args.latency_per_kb)
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(args.publications):
+            write_publication(directory, index, args.sentences)
+        write_feed(directory, args.publications)
+        with open(os.path.join(directory, "watchlist.toml"), "w") as f:
+            f.write(f'[[feeds]]\nurl = "file://{directory}/feed.xml"\nsource = "stand-in"\nmax_items = 100\n')
+        watchlist = load_watchlist(os.path.join(directory, "watchlist.toml"))
+        monitor = Monitor(
+            watchlist["feeds"],
+            InferenceClient(server.url),
+            PageFetcher(HttpCache(), extract_workers=0),
+            ResultStore(os.path.join(directory, "archive")),
+            result_cache=ResultCache(),
+            sentence_cache=ResultCache(max_entries=100_000),
+        )
+
+        print(f"{'pass':<22} {'s':>6} {'new':>4} {'changed':>8} {'unchanged':>10} {'requests':>9}")
+        for label in ("first", "nothing changed", "1 revised + 1 added"):
+            if label == "1 revised + 1 added":
+                write_publication(directory, 0, args.sentences, revision=1)
+                write_publication(directory, args.publications, args.sentences)
+                write_feed(directory, args.publications + 1)
+            requests_before = server.requests
+            start = time.perf_counter()
+            counts = monitor.run_once()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{label:<22} {elapsed:>6.2f} {counts['new']:>4} {counts['changed']:>8} {counts['unchanged']:>10} "
+                f"{server.requests - requests_before:>9}"
+            )
+        latest = monitor.store.list_documents(kind="watch", limit=3)
+        print(latest[["date", "title", "sentences"]].to_string(index=False))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
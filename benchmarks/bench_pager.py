@@ -0,0 +1,71 @@
+"""Bytes sent to the browser and server time per table update, whole table vs paged view.
+
+``st.dataframe`` serializes the frame it is given to Arrow IPC and ships it
+over the websocket. The whole-table column is what one ``st.dataframe(df)``
+sent before; the paged columns are one page of the ``ResultView``: the first
+query on a fresh view (filter + sort), then turning to the next page. The
+paged payload should stay flat as the result grows.
+
+    python -m benchmarks.bench_pager --sizes 1000 10000 100000 --page-size 100
+"""
+import argparse
+import random
+import time
+
+import pyarrow as pa
+
+from deciphering.pager import ResultView
+from deciphering.results import rows_to_frame, to_arrow
+
+AGENTS = ("central bank", "firms", "households", "financial sector", "government")
+SENTIMENTS = ("positive", "negative")
+
+
+def result(size, seed=0):
+    rng = random.Random(seed)
+    return rows_to_frame([
+        [
+            f"Sentence {i}: the committee judged that conditions had moved in line with its outlook.",
+            rng.choice(AGENTS), rng.random(), rng.choice(SENTIMENTS), rng.random(),
+        ]
+        for i in range(size)
+    ])
+
+
+def ipc_bytes(df):
+    sink = pa.BufferOutputStream()
+    table = to_arrow(df)
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().size
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--page-size", type=int, default=100)
+    args = parser.parse_args()
+
+    filters = {"Agent": ["firms", "households"], "Sentiment": ["negative"]}
+    sort = "Sentiment Probability"
+    print(f"{'rows':>8} {'whole KB':>9} {'whole ms':>9} {'page KB':>8} {'build ms':>9} "
+          f"{'query ms':>9} {'next page ms':>13}")
+    for size in args.sizes:
+        df = result(size)
+        whole_bytes, whole_ms = timed(lambda: ipc_bytes(df))
+        view, build_ms = timed(lambda: ResultView(df))
+        (page, _), query_ms = timed(lambda: view.page(0, args.page_size, filters, sort))
+        page_bytes = ipc_bytes(page)
+        _, next_ms = timed(lambda: ipc_bytes(view.page(1, args.page_size, filters, sort)[0]))
+        print(f"{size:>8,} {whole_bytes / 1024:>9,.0f} {whole_ms:>9.1f} {page_bytes / 1024:>8,.1f} "
+              f"{build_ms:>9.1f} {query_ms:>9.2f} {next_ms:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Script time per widget interaction, measured headlessly with Streamlit's AppTest.
+
+    python -m benchmarks.bench_rerun --runs 20
+    python -m benchmarks.bench_rerun --app /tmp/app_before.py   # compare another version
+
+AppTest reruns the whole script on every interaction, so this measures the
+work a full rerun does (asset decoding, page setup); fragment-scoped reruns
+in a live session are cheaper still.
+"""
+import argparse
+import logging
+import os
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def timed(step):
+    start = time.perf_counter()
+    step()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--app", default=os.path.join(ROOT, "app.py"))
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    os.chdir(ROOT)
+
+    at = AppTest.from_file(os.path.abspath(args.app), default_timeout=60)
+    print(f"first run        {timed(at.run):8.1f} ms")
+    interactions = {
+        "type text": lambda i: at.text_area[0].input(f"Inflation eased in month {i}.").run(),
+        "toggle input": lambda i: at.radio[0].set_value("URL" if i % 2 else "Text").run(),
+        "switch page": lambda i: at.switch_page("app_pages/faqs.py" if i % 2 else "app_pages/home.py").run(),
+    }
+    for name, interaction in interactions.items():
+        at.switch_page("app_pages/home.py").run()
+        at.radio[0].set_value("Text").run()
+        samples = [timed(lambda: interaction(i)) for i in range(args.runs)]
+        print(f"{name:<16} {statistics.median(samples):8.1f} ms median   {max(samples):8.1f} ms max")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Search latency over a large sentence index: full text, facets and both together.
+
+Indexes ``--documents`` synthetic statements of ``--sentences`` sentences
+each, spread over several banks and years, then times typical queries (the
+first ``--limit`` results, and the facet counts of the same filters).
+
+    python -m benchmarks.bench_search --documents 5000 --sentences 200
+"""
+import argparse
+import datetime
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.bench_timeseries import BANKS
+from benchmarks.stub_server import AGENTS, SENTIMENTS
+from deciphering.results import rows_to_frame
+from deciphering.search import SearchIndex
+
+TOPICS = (
+    "inflation", "employment", "growth", "wages", "credit", "housing", "energy", "prices", "rates", "demand",
+    "supply", "outlook", "risks", "lending", "spending", "investment", "productivity", "exports", "savings", "debt",
+)
+
+
+def vocabulary(size=20000, first_topic=40):
+    """Words with Zipf-like frequencies, as in real statements.
+
+    Filler words take the most frequent ranks (like "the" and "of"); the topic
+    words sit further down, so each appears in a few percent of sentences.
+    """
+    filler = [f"w{i}" for i in range(size - len(TOPICS))]
+    words = filler[:first_topic] + list(TOPICS) + filler[first_topic:]
+    return words, list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+
+def statement(rng, sentences, words, cum_weights):
+    return [
+        " ".join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(10, 30))).capitalize() + "."
+        for _ in range(sentences)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=5000)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=1000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words, cum_weights = vocabulary()
+    with tempfile.TemporaryDirectory() as directory:
+        index = SearchIndex(os.path.join(directory, "search.sqlite3"))
+        start = time.perf_counter()
+        for i in range(args.documents):
+            df = rows_to_frame([
+                [sentence, rng.choice(AGENTS), rng.random(), rng.choice(SENTIMENTS), rng.random()]
+                for sentence in statement(rng, args.sentences, words, cum_weights)
+            ])
+            date = datetime.date(2015, 1, 1) + datetime.timedelta(days=rng.randrange(3650))
+            index.add(f"doc-{i}", df, f"Statement {i}", rng.choice(BANKS), date)
+        build_s = time.perf_counter() - start
+        stats = index.stats()
+        size_mb = os.path.getsize(index.path) / 1024 / 1024
+        print(f"{stats['sentences']:,} sentences in {stats['documents']:,} documents, "
+              f"indexed in {build_s:.0f} s ({size_mb:,.0f} MB)")
+
+        year = {"since": datetime.date(2024, 1, 1), "until": datetime.date(2024, 12, 31)}
+        queries = {
+            "negative about households, ecb, 2024": dict(
+                agents=["households"], sentiments=["negative"], sources=["ecb"], **year
+            ),
+            "text 'housing credit'": dict(text="housing credit"),
+            "text 'wages productivity' + facets": dict(
+                text="wages productivity", agents=["households"], sentiments=["negative"], sources=["ecb"]
+            ),
+            "text prefix 'export*', p>0.9": dict(text="export*", sentiment_probability=(0.9, 1.0)),
+            "everything, newest first": dict(),
+        }
+        print(f"{'query':<40} {'rows':>6} {'search ms':>10} {'facets ms':>10}")
+        for label, query in queries.items():
+            start = time.perf_counter()
+            rows = index.search(limit=args.limit, **query)
+            search_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            _, complete = index.facets(**query)
+            facets_ms = (time.perf_counter() - start) * 1000
+            print(f"{label:<40} {len(rows):>6,} {search_ms:>10.1f} {facets_ms:>10.1f} {'' if complete else '(newest)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Cold start and first render of each page, each in a fresh Python process.
+
+For every page a new interpreter imports Streamlit, runs ``app.py`` once
+headlessly with AppTest on that page and reports the process wall time,
+the first render time, peak RSS and which heavy libraries got imported.
+The light pages (FAQs, About) should not import pandas, pyarrow or the
+HTTP client at all.
+
+    python -m benchmarks.bench_startup --runs 3
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = {
+    "Home": "app_pages/home.py",
+    "History": "app_pages/history.py",
+    "FAQs": "app_pages/faqs.py",
+    "About": "app_pages/about.py",
+}
+HEAVY_MODULES = ("pandas", "pyarrow", "numpy", "requests", "PIL")
+
+
+def render(page):
+    """Child process: render ``page`` once and print the measurements as JSON."""
+    import logging
+
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    imported = time.perf_counter()
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    at.switch_page(PAGES[page]).run()
+    rendered = time.perf_counter()
+    print(json.dumps({
+        "import_ms": (imported - start) * 1000,
+        "render_ms": (rendered - imported) * 1000,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "modules": [name for name in HEAVY_MODULES if name in sys.modules],
+        "errors": [str(exception.value) for exception in at.exception],
+    }))
+
+
+def measure(page):
+    start = time.perf_counter()
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_startup", "--child", page],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result["process_ms"] = (time.perf_counter() - start) * 1000
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--pages", nargs="+", default=list(PAGES), choices=list(PAGES))
+    parser.add_argument("--child", choices=list(PAGES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        return render(args.child)
+
+    for page in args.pages:
+        results = [measure(page) for _ in range(args.runs)]
+        median = {
+            key: statistics.median(result[key] for result in results) for key in ("process_ms", "render_ms", "rss_mb")
+        }
+        errors = results[-1]["errors"]
+        print(
+            f"{page:<8} process {median['process_ms']:7.0f} ms  first render {median['render_ms']:6.0f} ms  "
+            f"peak RSS {median['rss_mb']:5.0f} MB  imports: {', '.join(results[-1]['modules']) or '-'}"
+            + (f"  ERROR: {errors[0]}" if errors else "")
+        )
+
+
+if __name__ == "__main__":
+    main()
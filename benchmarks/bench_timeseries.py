@@ -0,0 +1,89 @@
+"""Sentiment time series from daily rollups vs a scan of the per-sentence archive.
+
+Archives ``--documents`` synthetic statements spread over ``--years`` for a
+few banks (each save also updates the daily rollups), then times a rolling
+net sentiment index per bank and agent, and an event-aligned profile, both
+from the rollups and by reading every archived Parquet file back.
+
+    python -m benchmarks.bench_timeseries --documents 1000 --years 10 --sentences 200
+"""
+import argparse
+import datetime
+import glob
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from benchmarks.stub_server import AGENTS, SENTIMENTS
+from deciphering.results import from_arrow, rows_to_frame
+from deciphering.store import ResultStore
+from deciphering.summary import sentiment_by_agent
+from deciphering.timeseries import align_to_events, sentiment_index
+
+BANKS = ("fed", "ecb", "boe", "boj", "snb")
+
+
+def timed(function):
+    start = time.perf_counter()
+    value = function()
+    return value, (time.perf_counter() - start) * 1000
+
+
+def scan_archive(store):
+    """The same daily totals, recomputed from every archived sentence."""
+    documents = store.list_documents().set_index("id")
+    frames = []
+    for path in glob.glob(os.path.join(store.root, "**", "*.parquet"), recursive=True):
+        df = from_arrow(pq.read_table(path, columns=["Agent", "Sentiment", "Sentiment Probability"]))
+        document = documents.loc[os.path.basename(path)[:-len(".parquet")]]
+        totals = sentiment_by_agent(df).reset_index()
+        frames.append(pd.DataFrame({
+            "source": document["source"],
+            "date": document["date"],
+            "agent": totals["Agent"].astype(str),
+            "documents": 1,
+            "sentences": totals["Sentences"],
+            "net_sum": totals["Net Sentiment"] * totals["Sentences"],
+        }))
+    return pd.concat(frames).groupby(["source", "date", "agent"], as_index=False).sum()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--sentences", type=int, default=200)
+    parser.add_argument("--window", type=int, default=90)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    first_day = datetime.date.today() - datetime.timedelta(days=365 * args.years)
+    with tempfile.TemporaryDirectory() as directory:
+        store = ResultStore(directory)
+        save_ms = []
+        for i in range(args.documents):
+            date = first_day + datetime.timedelta(days=rng.randrange(365 * args.years))
+            df = rows_to_frame([
+                [f"Sentence {j}.", rng.choice(AGENTS), rng.random(), rng.choice(SENTIMENTS), rng.random()]
+                for j in range(args.sentences)
+            ])
+            _, ms = timed(lambda: store.save(df, f"doc-{i}", f"Statement {i}", "text", rng.choice(BANKS), date))
+            save_ms.append(ms)
+        events = sorted(set(store.daily_sentiment(sources=["fed"])["date"]))
+        print(f"{args.documents:,} documents over {args.years} years, "
+              f"{args.documents * args.sentences:,} sentences; save with rollup: {sum(save_ms) / len(save_ms):.1f} ms")
+
+        for label, load in (("daily rollups", store.daily_sentiment), ("archive scan", lambda: scan_archive(store))):
+            daily, load_ms = timed(load)
+            _, index_ms = timed(lambda: sentiment_index(daily, "Bank and agent", args.window))
+            _, events_ms = timed(lambda: align_to_events(daily, events, "Agent", 30, 30))
+            print(f"{label:<14} load {load_ms:>8.1f} ms  rolling index {index_ms:>6.1f} ms  "
+                  f"{len(events)} events aligned {events_ms:>6.1f} ms  ({len(daily):,} rows)")
+
+
+if __name__ == "__main__":
+    main()
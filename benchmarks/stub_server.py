@@ -0,0 +1,304 @@
+"""Local stand-in for the inference API.
+
+Implements ``POST /predict`` and ``GET /predict_by_url`` with the same
+five-column response as the Cloud Run service (or, when the client accepts
+``application/x-ndjson``, one row per line streamed as it is scored), plus an artificial latency (fixed
+per request and/or per KB of input text, like a model that scores sentence by
+sentence) so client-side changes can be measured without the real model.
+Failures can be injected too: a share of requests answered with 503
+(``error_rate``), or the whole replica marked down (``healthy = False``).
+``concurrency`` caps how many requests it scores at once, like a model
+server with a fixed number of workers; by default there is no cap.
+``url_sentences`` sets the size of the page behind every ``/predict_by_url``.
+``GET /`` reports whether it is up, for health checks.
+``GET /pages/<name>`` serves that page as HTML (with navigation and script
+boilerplate around the text) with an ``ETag`` and ``Last-Modified``, and
+answers ``304`` to a matching conditional GET until ``change_page(name)``.
+
+It also stands in for the job API used for long URL analyses:
+``POST /jobs`` (``{"url": ...}``) returns a job id, ``GET /jobs/<id>``
+reports ``queued``/``running``/``done`` with a progress fraction (holding the
+request for up to ``?wait=`` seconds until something changes) and
+``GET /jobs/<id>/result`` returns the rows once the job is done.
+
+    python -m benchmarks.stub_server --port 8000 --latency 0.05
+"""
+import argparse
+import contextlib
+import email.utils
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+AGENTS = ("households", "firms", "financial sector", "government", "central bank")
+SENTIMENTS = ("positive", "negative")
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+
+def score_text(text):
+    """Deterministic fake scores, one row per sentence."""
+    rows = []
+    for sentence in _SENTENCE_END.split(text.strip()):
+        if not sentence:
+            continue
+        h = sum(map(ord, sentence))
+        rows.append([
+            sentence,
+            AGENTS[h % len(AGENTS)],
+            0.5 + (h % 50) / 100,
+            SENTIMENTS[h % 2],
+            0.5 + (h % 37) / 74,
+        ])
+    return rows
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _wants_ndjson(self):
+        return "application/x-ndjson" in self.headers.get("Accept", "")
+
+    def _stream_ndjson(self, rows):
+        """Send rows one per line with chunked encoding, spreading the latency across them."""
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for row in rows:
+            self._pause(len(row[0].encode("utf-8")), share=1 / len(rows))
+            line = json.dumps(row).encode("utf-8") + b"\n"
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _pause(self, size=0, share=1.0):
+        """Sleep for ``share`` of the fixed latency plus the per-KB latency of ``size`` bytes."""
+        delay = self.server.latency * share + self.server.latency_per_kb * size / 1024
+        if delay:
+            with self.server.slots:
+                time.sleep(delay)
+
+    def _fail(self):
+        """Answer 503 if the server is down or this request drew an injected failure."""
+        if self.server.healthy and random.random() >= self.server.error_rate:
+            return False
+        self._read_body()
+        self.server.count_request(failed=True)
+        self._send_json({"detail": "Service Unavailable"}, 503)
+        return True
+
+    def do_POST(self):
+        if self._fail():
+            return
+        if urlsplit(self.path).path == "/jobs":
+            url = json.loads(self._read_body())["url"]
+            self.server.count_request()
+            return self._send_json({"job_id": self.server.start_job(url), "status": "queued"}, 202)
+        if urlsplit(self.path).path != "/predict":
+            return self._send_json({"detail": "Not Found"}, 404)
+        text = json.loads(self._read_body())
+        self.server.count_request()
+        if self._wants_ndjson():
+            return self._stream_ndjson(score_text(text))
+        self._pause(len(text.encode("utf-8")))
+        self._send_json(score_text(text))
+
+    def _job(self, parts):
+        segments = parts.path.strip("/").split("/")
+        job = self.server.jobs.get(segments[1]) if len(segments) > 1 else None
+        if job is None:
+            return self._send_json({"detail": "Job not found"}, 404)
+        if len(segments) == 3 and segments[2] == "result":
+            if job["status"] != "done":
+                return self._send_json({"detail": "Job not finished"}, 409)
+            return self._send_json(job["result"])
+        wait = float(parse_qs(parts.query).get("wait", ["0"])[0])
+        self._send_json(self.server.job_status(job, wait))
+
+    def _page(self, path):
+        body, etag, last_modified = self.server.page(path)
+        if self.headers.get("If-None-Match") == etag or (
+            "If-None-Match" not in self.headers and self.headers.get("If-Modified-Since") == last_modified
+        ):
+            self.server.count_page(modified=False)
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.server.count_page(modified=True)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/":
+            healthy = self.server.healthy
+            return self._send_json({"status": "ok" if healthy else "down"}, 200 if healthy else 503)
+        if self._fail():
+            return
+        if parts.path.startswith("/jobs/"):
+            return self._job(parts)
+        if parts.path.startswith("/pages/"):
+            return self._page(parts.path)
+        if parts.path != "/predict_by_url":
+            return self._send_json({"detail": "Not Found"}, 404)
+        url = parse_qs(parts.query).get("url", [""])[0]
+        self.server.count_request()
+        text = self.server.page_text(url)
+        rows = score_text(text)
+        if self._wants_ndjson():
+            return self._stream_ndjson(rows)
+        self._pause(len(text.encode("utf-8")))
+        self._send_json(rows)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address, latency=0.0, latency_per_kb=0.0, job_seconds=2.0, error_rate=0.0, concurrency=0, url_sentences=1
+    ):
+        super().__init__(address, StubHandler)
+        self.latency = latency
+        self.latency_per_kb = latency_per_kb
+        self.job_seconds = job_seconds
+        self.error_rate = error_rate
+        self.url_sentences = url_sentences
+        self.slots = threading.BoundedSemaphore(concurrency) if concurrency else contextlib.nullcontext()
+        self.healthy = True
+        self.requests = 0
+        self.failures = 0
+        self.page_downloads = 0
+        self.pages_not_modified = 0
+        self.page_versions = {}
+        self.jobs = {}
+        self._lock = threading.Lock()
+        self._job_changed = threading.Condition(self._lock)
+
+    def page_text(self, url):
+        """The text the stub pretends to find at ``url``: ``url_sentences`` sentences after a title."""
+        sentences = (f"The outlook for inflation is stable ({i})." for i in range(1, self.url_sentences))
+        return " ".join([f"Fetched {url}.", "The outlook for inflation is stable.", *sentences])
+
+    def page(self, path):
+        """HTML body, ETag and Last-Modified of the page at ``path``."""
+        version, changed_at = self.page_versions.setdefault(path, (0, time.time()))
+        text = self.page_text(self.url + path) + (f" It was revised {version} times." if version else "")
+        paragraphs = "".join(f"<p>{sentence}</p>" for sentence in _SENTENCE_END.split(text))
+        body = (
+            "<html><head><title>Statement</title><script>var tracking = 1;</script></head><body>"
+            "<nav><a href='/'>Home</a> <a href='/press'>Press</a></nav>"
+            f"<article>{paragraphs}</article><footer>Copyright</footer></body></html>"
+        ).encode("utf-8")
+        etag = '"' + hashlib.sha256(body).hexdigest()[:16] + '"'
+        return body, etag, email.utils.formatdate(changed_at, usegmt=True)
+
+    def change_page(self, path):
+        """Publish a new version of the page at ``path``."""
+        version, _ = self.page_versions.get(path, (0, 0))
+        self.page_versions[path] = (version + 1, time.time())
+
+    def count_page(self, modified):
+        with self._lock:
+            self.page_downloads += modified
+            self.pages_not_modified += not modified
+
+    def count_request(self, failed=False):
+        with self._lock:
+            self.requests += 1
+            self.failures += failed
+
+    def start_job(self, url, steps=10):
+        job_id = uuid.uuid4().hex
+        self.jobs[job_id] = {"job_id": job_id, "status": "queued", "progress": 0.0, "error": None}
+
+        def run():
+            job = self.jobs[job_id]
+            for step in range(1, steps + 1):
+                time.sleep(self.job_seconds / steps)
+                with self._job_changed:
+                    job.update(status="running", progress=step / steps)
+                    self._job_changed.notify_all()
+            with self._job_changed:
+                job["result"] = score_text(self.page_text(url))
+                job["status"] = "done"
+                self._job_changed.notify_all()
+
+        threading.Thread(target=run, daemon=True).start()
+        return job_id
+
+    def job_status(self, job, wait=0.0):
+        """The job's public fields, after waiting up to ``wait`` seconds for a change."""
+        with self._job_changed:
+            before = (job["status"], job["progress"])
+            self._job_changed.wait_for(lambda: (job["status"], job["progress"]) != before, timeout=wait)
+            return {key: job[key] for key in ("job_id", "status", "progress", "error")}
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(port=0, **options):
+    """Serve in a daemon thread and return the server; call ``shutdown()`` when done."""
+    server = StubServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every request")
+    parser.add_argument("--latency-per-kb", type=float, default=0.0, help="seconds added per KB of /predict input")
+    parser.add_argument("--job-seconds", type=float, default=2.0, help="time a /jobs analysis takes")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    parser.add_argument("--concurrency", type=int, default=0, help="requests scored at once (0: unlimited)")
+    parser.add_argument("--url-sentences", type=int, default=1, help="sentences on every fetched page")
+    args = parser.parse_args()
+    server = StubServer(
+        ("127.0.0.1", args.port),
+        latency=args.latency,
+        latency_per_kb=args.latency_per_kb,
+        job_seconds=args.job_seconds,
+        error_rate=args.error_rate,
+        concurrency=args.concurrency,
+        url_sentences=args.url_sentences,
+    )
+    print(f"Stub inference API on {server.url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
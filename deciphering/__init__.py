@@ -0,0 +1 @@
+"""Client-side helpers for the Deciphering Central Banks Streamlit app."""
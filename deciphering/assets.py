@@ -0,0 +1,160 @@
+"""Static images: a build step that pre-renders optimized variants, and the runtime loaders.
+
+``python -m deciphering.assets`` writes WebP (and AVIF, when Pillow supports
+it) copies of every image in ``Resources/`` at a few display widths into
+``static/img/``, named by content hash and listed in ``manifest.json``.
+Streamlit serves that folder as-is at ``app/static/img/`` (see
+``.streamlit/config.toml``), so ``picture_html`` can hand the browser a
+``<picture>`` with every variant and let it download the smallest one that
+fits. ``st.image`` would re-encode them to JPEG or PNG. Without a build,
+``load_image_bytes`` resizes the original for ``st.image`` instead.
+
+Pillow is only imported to build variants or resize originals: serving a
+built ``<picture>`` needs nothing but the manifest.
+"""
+import argparse
+import hashlib
+import io
+import json
+import os
+
+RESOURCES_DIR = "Resources"
+BUILD_DIR = os.path.join("static", "img")
+BUILD_URL = "app/static/img/"
+MANIFEST = "manifest.json"
+WIDTHS = (120, 240, 640, 960, 1280, 1600, 1920)
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+# Most compact first: <picture> offers them to the browser in this order.
+FORMAT_PREFERENCE = ("avif", "webp")
+
+
+def _formats():
+    from PIL import features
+
+    formats = {}
+    if features.check("avif"):
+        formats["avif"] = {"format": "AVIF", "quality": 60}
+    formats["webp"] = {"format": "WEBP", "quality": 80, "method": 6}
+    return formats
+
+
+def _resize(image, width):
+    from PIL import Image
+
+    if image.width <= width:
+        return image
+    return image.resize((width, round(image.height * width / image.width)), Image.LANCZOS)
+
+
+def build_variants(resources_dir=RESOURCES_DIR, build_dir=BUILD_DIR, widths=WIDTHS):
+    """Render every image in ``resources_dir`` at each width and format; return the manifest.
+
+    Variants left over from a previous build are deleted.
+    """
+    from PIL import Image
+
+    os.makedirs(build_dir, exist_ok=True)
+    manifest = {}
+    for name in sorted(os.listdir(resources_dir)):
+        stem, extension = os.path.splitext(name)
+        if extension.lower() not in IMAGE_EXTENSIONS:
+            continue
+        with Image.open(os.path.join(resources_dir, name)) as original:
+            original.load()
+        variants = []
+        for width in sorted({min(width, original.width) for width in widths}):
+            image = _resize(original, width)
+            for suffix, options in _formats().items():
+                buffer = io.BytesIO()
+                image.save(buffer, **options)
+                data = buffer.getvalue()
+                filename = f"{stem}-{width}w-{hashlib.sha256(data).hexdigest()[:10]}.{suffix}"
+                with open(os.path.join(build_dir, filename), "wb") as f:
+                    f.write(data)
+                variants.append({"width": width, "format": suffix, "file": filename, "bytes": len(data)})
+        manifest[name] = variants
+    with open(os.path.join(build_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    current = {variant["file"] for variants in manifest.values() for variant in variants} | {MANIFEST}
+    for name in os.listdir(build_dir):
+        if name not in current:
+            os.remove(os.path.join(build_dir, name))
+    return manifest
+
+
+def read_manifest(build_dir=BUILD_DIR):
+    try:
+        with open(os.path.join(build_dir, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def pick_variant(variants, max_width):
+    """The smallest (in bytes) variant at least ``max_width`` wide, else the widest one."""
+    if not variants:
+        return None
+    wide_enough = [variant for variant in variants if variant["width"] >= max_width]
+    if wide_enough:
+        return min(wide_enough, key=lambda variant: variant["bytes"])
+    widest = max(variant["width"] for variant in variants)
+    return min((v for v in variants if v["width"] == widest), key=lambda variant: variant["bytes"])
+
+
+def picture_html(name, sizes, width=None, alt="", build_dir=BUILD_DIR, base_url=BUILD_URL):
+    """A ``<picture>`` offering every pre-built variant of ``name``, or None without a build.
+
+    ``sizes`` is the HTML sizes attribute (e.g. ``"100vw"`` or ``"120px"``);
+    ``width`` fixes the rendered width in CSS pixels, otherwise the image
+    fills its container.
+    """
+    variants = read_manifest(build_dir).get(name)
+    if not variants:
+        return None
+    sources = []
+    for suffix in FORMAT_PREFERENCE:
+        srcset = ", ".join(
+            f"{base_url}{variant['file']} {variant['width']}w" for variant in variants if variant["format"] == suffix
+        )
+        if srcset:
+            sources.append(f'<source type="image/{suffix}" srcset="{srcset}" sizes="{sizes}">')
+    fallback = pick_variant([v for v in variants if v["format"] == "webp"] or variants, width or 1280)
+    style = f'width:{width}px' if width else 'width:100%'
+    return (
+        f"<picture>{''.join(sources)}"
+        f'<img src="{base_url}{fallback["file"]}" alt="{alt}" style="{style};height:auto" decoding="async">'
+        "</picture>"
+    )
+
+
+def load_image_bytes(path, max_width):
+    """Re-encode ``path`` no wider than ``max_width``: PNG if it has transparency, else JPEG.
+
+    The result is meant to be cached by the caller.
+    """
+    from PIL import Image
+
+    with Image.open(path) as image:
+        image.load()
+        image = _resize(image, max_width)
+        buffer = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            image.save(buffer, "PNG", optimize=True)
+        else:
+            image.convert("RGB").save(buffer, "JPEG", quality=85, optimize=True, progressive=True)
+        return buffer.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render optimized variants of the images in Resources/.")
+    parser.add_argument("--resources", default=RESOURCES_DIR)
+    parser.add_argument("--output", default=BUILD_DIR)
+    args = parser.parse_args()
+    for name, variants in build_variants(args.resources, args.output).items():
+        original = os.path.getsize(os.path.join(args.resources, name))
+        smallest = min(variant["bytes"] for variant in variants)
+        print(f"{name}: {original / 1024:.0f} KB original, {len(variants)} variants from {smallest / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
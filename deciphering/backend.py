@@ -0,0 +1,100 @@
+"""Builders for the inference backend, caches and archive, from ``config``.
+
+Shared by the Streamlit app (which keeps one of each per process, see
+``services``) and by processes that run without Streamlit, like the
+watch-list monitor.
+"""
+import os
+
+from deciphering import config
+from deciphering.cache import ResultCache
+from deciphering.chunking import iter_chunked
+from deciphering.client import InferenceClient
+from deciphering.dedup import iter_deduplicated
+from deciphering.fetch import HttpCache, PageFetcher
+from deciphering.local import LocalInferenceEngine
+from deciphering.search import SearchIndex
+from deciphering.store import ResultStore
+
+
+def create_client():
+    """The API client, or the classifiers themselves with ``DCB_BACKEND=local``."""
+    if config.BACKEND == "local":
+        return LocalInferenceEngine.from_pretrained(
+            config.LOCAL_AGENT_MODEL,
+            config.LOCAL_SENTIMENT_MODEL,
+            batch_size=config.LOCAL_BATCH_SIZE,
+            device=config.LOCAL_DEVICE,
+            fetch_timeout=(config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT),
+        )
+    return InferenceClient(
+        config.API_URLS,
+        pool_size=config.HTTP_POOL_SIZE,
+        connect_timeout=config.HTTP_CONNECT_TIMEOUT,
+        read_timeout=config.HTTP_READ_TIMEOUT,
+        retries=config.HTTP_RETRIES,
+        backoff=config.HTTP_RETRY_BACKOFF,
+        gzip_min_bytes=config.HTTP_GZIP_MIN_BYTES,
+        strategy=config.LB_STRATEGY,
+        failure_threshold=config.CIRCUIT_FAILURES,
+        cooldown=config.CIRCUIT_COOLDOWN,
+        health_path=config.HEALTH_PATH,
+        health_interval=config.HEALTH_INTERVAL,
+    )
+
+
+def create_result_cache():
+    return ResultCache(
+        max_entries=config.CACHE_MAX_ENTRIES,
+        max_bytes=config.CACHE_MAX_BYTES,
+        ttl=config.CACHE_TTL,
+        path=config.CACHE_DB or None,
+    )
+
+
+def create_sentence_cache():
+    if not config.SENTENCE_CACHE:
+        return None
+    return ResultCache(
+        max_entries=config.SENTENCE_CACHE_MAX_ENTRIES,
+        max_bytes=config.CACHE_MAX_BYTES,
+        ttl=config.SENTENCE_CACHE_TTL,
+        path=config.SENTENCE_CACHE_DB or None,
+    )
+
+
+def create_result_store():
+    return ResultStore(config.ARCHIVE_DIR) if config.ARCHIVE_DIR else None
+
+
+def create_search_index():
+    return SearchIndex(os.path.join(config.ARCHIVE_DIR, "search.sqlite3")) if config.ARCHIVE_DIR else None
+
+
+def create_page_fetcher():
+    return PageFetcher(
+        HttpCache(config.HTTP_CACHE_DB or None),
+        timeout=(config.HTTP_CONNECT_TIMEOUT, config.HTTP_READ_TIMEOUT),
+        pool_size=config.HTTP_POOL_SIZE,
+        extract_workers=config.EXTRACT_WORKERS,
+    )
+
+
+def iter_score_text(client, text, sentence_cache=None):
+    """Stream the rows of ``text``: in parallel chunks, and only for sentences missing from ``sentence_cache``."""
+
+    def predict(text):
+        if config.BACKEND == "local":
+            # The local engine batches sentences itself; chunks would only queue for the model.
+            return client.stream_text(text)
+        return iter_chunked(
+            client.predict_text,
+            text,
+            max_bytes=config.CHUNK_MAX_BYTES,
+            max_workers=config.CHUNK_CONCURRENCY,
+            stream=client.stream_text,
+        )
+
+    if sentence_cache is None:
+        return predict(text)
+    return iter_deduplicated(text, sentence_cache, predict)
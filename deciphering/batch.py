@@ -0,0 +1,47 @@
+"""Concurrent analysis of many documents at once.
+
+Documents are scored through a bounded thread pool; results come back in
+completion order so the caller can report progress per item, and are merged
+into a single table tagged with the document they came from.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from deciphering.metrics import propagate
+from deciphering.results import conform, rows_to_frame
+
+
+def run_batch(documents, analyze, max_workers=4):
+    """Yield ``(name, rows, error)`` for each ``(name, value)`` as soon as it finishes.
+
+    ``analyze`` is called with ``value`` from a worker thread, in a copy of
+    the caller's context; at most ``max_workers`` calls are in flight at any
+    time.
+    """
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="batch") as pool:
+        futures = {pool.submit(propagate(analyze), value): name for name, value in documents}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                yield name, future.result(), None
+            except Exception as e:
+                yield name, None, e
+
+
+def merge_results(results):
+    """Concatenate ``{name: rows}`` into one frame with a leading Document column."""
+    frames = []
+    for name, rows in results.items():
+        if not rows:
+            continue
+        frame = rows_to_frame(rows)
+        frame.insert(0, 'Document', name)
+        frames.append(frame)
+    if not frames:
+        frame = rows_to_frame([])
+        frame.insert(0, 'Document', pd.Categorical([]))
+        return frame
+    merged = pd.concat(frames, ignore_index=True)
+    merged['Document'] = merged['Document'].astype('category')
+    return conform(merged)
@@ -0,0 +1,156 @@
+"""Content-addressed cache for inference results.
+
+Results are keyed by a hash of the normalized input, so pasting the same
+statement twice (or the same URL written slightly differently) only costs one
+call to the API. Entries live in an in-process LRU bounded by count, bytes and
+age, with an optional SQLite file underneath that survives app restarts.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from deciphering.decode import dumps, loads
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_text(text):
+    """Unicode-normalize and collapse whitespace so cosmetic edits hit the cache."""
+    text = unicodedata.normalize("NFC", text)
+    return " ".join(text.split())
+
+
+def canonical_url(url):
+    """Lower-case scheme and host, drop default ports, fragments and query ordering."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower() or "https"
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def _digest(kind, value):
+    return f"{kind}:" + hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def text_key(text):
+    return _digest("text", normalize_text(text))
+
+
+def url_key(url):
+    return _digest("url", canonical_url(url))
+
+
+def rows_key(rows):
+    """Key of a result itself, for inputs that do not identify their content (a page that may change)."""
+    return _digest("rows", json.dumps(rows, separators=(",", ":"), ensure_ascii=False))
+
+
+def sentence_key(sentence):
+    return _digest("sentence", normalize_text(sentence))
+
+
+class ResultCache:
+    """Two-level LRU + SQLite cache of API results (lists of rows)."""
+
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024, ttl=24 * 60 * 60, path=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (stored_at, payload bytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, payload BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, stored_at, now):
+        return bool(self.ttl) and now - stored_at > self.ttl
+
+    def get(self, key):
+        """Return the cached rows for ``key`` or None, counting the hit or miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0], now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return loads(entry[1])
+                self._evict(key)
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT stored_at, payload FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[0], now):
+                        self._remember(key, row[0], row[1])
+                        self.hits += 1
+                        self.disk_hits += 1
+                        return loads(row[1])
+                    self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+                    self._db.commit()
+            self.misses += 1
+            return None
+
+    def put(self, key, rows):
+        self.put_many([(key, rows)])
+
+    def put_many(self, items):
+        """Store several ``(key, rows)`` pairs in one SQLite transaction."""
+        now = time.time()
+        entries = [(key, now, dumps(rows)) for key, rows in items]
+        with self._lock:
+            for key, stored_at, payload in entries:
+                self._remember(key, stored_at, payload)
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO results (key, stored_at, payload) VALUES (?, ?, ?)", entries
+                )
+                self._db.commit()
+
+    def _remember(self, key, stored_at, payload):
+        if key in self._entries:
+            self._evict(key)
+        if len(payload) > self.max_bytes:
+            return
+        self._entries[key] = (stored_at, payload)
+        self._bytes += len(payload)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._evict(next(iter(self._entries)))
+
+    def _evict(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
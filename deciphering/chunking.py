@@ -0,0 +1,93 @@
+"""Sentence-aligned chunking of long texts.
+
+The API scores text sentence by sentence, so a long report can be cut at
+sentence boundaries, scored in parallel pieces and stitched back together
+without changing the result. Each request body stays under a fixed byte budget
+instead of carrying the whole document.
+"""
+import re
+
+from deciphering.batch import run_batch
+from deciphering.metrics import stage
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+
+
+def sentence_spans(text):
+    """``(start, end)`` offsets in ``text`` of the sentences ``split_sentences`` returns."""
+    spans, start = [], 0
+    for match in _SENTENCE_END.finditer(text):
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+    return [(start, end) for start, end in spans if text[start:end].strip()]
+
+
+def split_sentences(text):
+    """Split on sentence-ending punctuation followed by whitespace, and on blank lines."""
+    return [text[start:end] for start, end in sentence_spans(text)]
+
+
+def _split_oversized(sentence, max_bytes):
+    """Cut a single sentence longer than the budget on whitespace."""
+    piece, size = [], 0
+    for word in sentence.split():
+        word_size = len(word.encode("utf-8")) + 1
+        if piece and size + word_size > max_bytes:
+            yield " ".join(piece)
+            piece, size = [], 0
+        piece.append(word)
+        size += word_size
+    if piece:
+        yield " ".join(piece)
+
+
+def chunk_text(text, max_bytes=16384):
+    """Group consecutive sentences into chunks of at most ``max_bytes`` UTF-8 bytes."""
+    chunks, current, size = [], [], 0
+    for sentence in split_sentences(text):
+        sentence_size = len(sentence.encode("utf-8")) + 1
+        pieces = [sentence] if sentence_size <= max_bytes else list(_split_oversized(sentence, max_bytes))
+        for piece in pieces:
+            piece_size = len(piece.encode("utf-8")) + 1
+            if current and size + piece_size > max_bytes:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            current.append(piece)
+            size += piece_size
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def iter_chunked(predict, text, max_bytes=16384, max_workers=4, stream=None):
+    """Yield batches of rows for ``text`` in document order as soon as they are ready.
+
+    Long texts are scored one chunk per ``predict`` call, and a chunk is
+    yielded once every chunk before it has arrived. Texts that fit in one
+    chunk are sent unchanged, through ``stream`` when given so a streaming
+    backend can deliver rows one by one. If any chunk fails, its error is
+    raised.
+    """
+    if len(text) <= max_bytes // 4 or (len(text) <= max_bytes and len(text.encode("utf-8")) <= max_bytes):
+        if stream is not None:
+            yield from stream(text)
+        else:
+            yield predict(text)
+        return
+    with stage("parse"):
+        chunks = chunk_text(text, max_bytes)
+    pending = {}
+    next_index = 0
+    for index, rows, error in run_batch(enumerate(chunks), predict, max_workers):
+        if error is not None:
+            raise error
+        pending[index] = rows
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+
+def predict_chunked(predict, text, max_bytes=16384, max_workers=4):
+    """Score ``text`` with ``predict`` one chunk per call; returns all rows in order."""
+    return [row for rows in iter_chunked(predict, text, max_bytes, max_workers) for row in rows]
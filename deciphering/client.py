@@ -0,0 +1,212 @@
+"""HTTP client for the inference API.
+
+One ``InferenceClient`` is meant to be built per process and shared by every
+Streamlit session: it keeps a pool of keep-alive connections to the backend,
+bounds every call with connect/read timeouts and retries cold starts and
+overload responses (429/5xx) with exponential backoff.
+
+``base_url`` may also be a list of replicas of the API: each call then goes
+to the endpoint picked by an ``EndpointPool`` and, if that one is down or
+keeps failing, transparently to the next best one.
+"""
+import gzip
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from deciphering.decode import dumps, loads
+from deciphering.endpoints import EndpointPool
+from deciphering.metrics import METRICS, record, stage
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+NDJSON = "application/x-ndjson"
+
+
+class InferenceClient:
+    def __init__(
+        self,
+        base_url,
+        pool_size=10,
+        connect_timeout=5,
+        read_timeout=300,
+        retries=3,
+        backoff=0.5,
+        gzip_min_bytes=0,
+        strategy="least_outstanding",
+        failure_threshold=3,
+        cooldown=30.0,
+        health_path="/",
+        health_interval=10.0,
+    ):
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        self.pool = EndpointPool(urls, strategy, failure_threshold, cooldown)
+        self.base_url = self.pool.endpoints[0].url
+        self.timeout = (connect_timeout, read_timeout)
+        self.gzip_min_bytes = gzip_min_bytes
+        self.retries = retries
+        self.backoff = backoff
+        if len(urls) > 1:
+            # Retried here instead, each attempt going to the next best endpoint.
+            retry = 0
+        else:
+            retry = Retry(
+                total=retries,
+                # A read timeout means the backend is busy with the request: sending it
+                # again would only multiply the wait. Raised as requests.ReadTimeout.
+                read=False,
+                backoff_factor=backoff,
+                status_forcelist=RETRY_STATUSES,
+                # Both endpoints are pure functions of their input, so POST is safe to retry.
+                allowed_methods=None,
+                raise_on_status=False,
+            )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+        self._closed = threading.Event()
+        if len(self.pool.endpoints) > 1 and health_interval:
+            threading.Thread(
+                target=self._health_loop, args=(health_path, health_interval, connect_timeout), daemon=True
+            ).start()
+
+    def _health_loop(self, path, interval, timeout):
+        # Plain session: a probe must not sit through the retry backoff.
+        with requests.Session() as session:
+            while not self._closed.wait(interval):
+                self.pool.check_health(session, path, timeout)
+
+    def _request(self, method, path, pinned=False, **kwargs):
+        """Send a request, failing over to other endpoints on connection errors and 429/5xx.
+
+        With several endpoints, each round tries every one of them, best
+        first, and ``retries`` more rounds follow with exponential backoff.
+        Read timeouts are raised straight away, without retrying.
+        ``pinned`` requests only ever go to the first endpoint.
+        """
+        endpoints = self.pool.endpoints[:1] if pinned else self.pool.endpoints
+        rounds = self.retries + 1 if len(self.pool.endpoints) > 1 else 1
+        for round_ in range(rounds):
+            if round_:
+                time.sleep(self.backoff * 2 ** (round_ - 1))
+            tried = []
+            while len(tried) < len(endpoints):
+                endpoint = self.pool.acquire(endpoints[0]) if pinned else self.pool.pick(tried)
+                tried.append(endpoint)
+                last = round_ == rounds - 1 and len(tried) == len(endpoints)
+                start = time.perf_counter()
+                try:
+                    response = self.session.request(method, endpoint.url + path, **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    record("network", time.perf_counter() - start)
+                    METRICS.inc("dcb_backend_requests_total", status="error")
+                    self.pool.release(endpoint, ok=False)
+                    # Fail over on connection errors (connect timeouts included), not
+                    # on read timeouts: another endpoint would take as long again.
+                    if last or not isinstance(e, requests.ConnectionError):
+                        raise
+                    continue
+                # For streamed responses this is the time to the headers.
+                elapsed = time.perf_counter() - start
+                record("network", elapsed)
+                METRICS.inc("dcb_backend_requests_total", status=response.status_code)
+                failed = response.status_code in RETRY_STATUSES
+                self.pool.release(endpoint, elapsed, ok=not failed)
+                if failed and not last:
+                    response.close()
+                    continue
+                response.raise_for_status()
+                return response
+
+    def _post_json(self, path, payload, **kwargs):
+        with stage("request build"):
+            body = dumps(payload)
+            headers = {"Content-Type": "application/json", **kwargs.pop("headers", {})}
+            if self.gzip_min_bytes and len(body) >= self.gzip_min_bytes:
+                body = gzip.compress(body, compresslevel=5)
+                headers["Content-Encoding"] = "gzip"
+        return self._request("POST", path, data=body, headers=headers, timeout=self.timeout, **kwargs)
+
+    def _get(self, path, params, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self._request("GET", path, params=params, **kwargs)
+
+    @staticmethod
+    def _read_rows(response):
+        with stage("network"):
+            content = response.content
+        with stage("decode"):
+            return loads(content)
+
+    @classmethod
+    def _iter_rows(cls, response):
+        """Yield batches of rows: one per NDJSON line, or the whole body for plain JSON."""
+        with response:
+            if not response.headers.get("Content-Type", "").startswith(NDJSON):
+                yield cls._read_rows(response)
+                return
+            # Timed per line but recorded once: waiting for the next line is network time.
+            network = decode = 0.0
+            lines = response.iter_lines()
+            try:
+                while True:
+                    start = time.perf_counter()
+                    line = next(lines, None)
+                    parsed = time.perf_counter()
+                    network += parsed - start
+                    if line is None:
+                        break
+                    if line:
+                        rows = [loads(line)]
+                        decode += time.perf_counter() - parsed
+                        yield rows
+            finally:
+                record("network", network)
+                record("decode", decode)
+
+    def predict_text(self, text):
+        """Score ``text`` sentence by sentence; returns the API's list of rows."""
+        return self._read_rows(self._post_json("/predict", str(text)))
+
+    def predict_url(self, url):
+        """Let the backend fetch and score ``url``; returns the API's list of rows."""
+        return self._read_rows(self._get("/predict_by_url", {"url": url}))
+
+    def stream_text(self, text):
+        """Like ``predict_text``, but yields rows as the backend sends them."""
+        headers = {"Accept": f"{NDJSON}, application/json"}
+        response = self._post_json("/predict", str(text), headers=headers, stream=True)
+        yield from self._iter_rows(response)
+
+    def stream_url(self, url):
+        """Like ``predict_url``, but yields rows as the backend sends them."""
+        headers = {"Accept": f"{NDJSON}, application/json"}
+        response = self._get("/predict_by_url", {"url": url}, headers=headers, stream=True)
+        yield from self._iter_rows(response)
+
+    # Jobs live on the replica that accepted them, so they all go to the first endpoint.
+    def submit_url_job(self, url):
+        """Queue a background analysis of ``url``; returns the job id."""
+        return loads(self._post_json("/jobs", {"url": url}, pinned=True).content)["job_id"]
+
+    def job_status(self, job_id, wait=0):
+        """Return the job's ``{"status", "progress", "error"}``.
+
+        With ``wait`` the backend may hold the request up to that many seconds
+        until the status changes (long polling).
+        """
+        params = {"wait": wait} if wait else None
+        timeout = (self.timeout[0], self.timeout[1] + wait)
+        return loads(self._get(f"/jobs/{job_id}", params, timeout=timeout, pinned=True).content)
+
+    def job_result(self, job_id):
+        """Rows of a finished job, in the same shape as ``predict_url``."""
+        return loads(self._get(f"/jobs/{job_id}/result", None, pinned=True).content)
+
+    def close(self):
+        self._closed.set()
+        self.session.close()
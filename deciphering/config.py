@@ -0,0 +1,139 @@
+"""Runtime settings, read once from the environment.
+
+Every setting has a default that reproduces the behaviour of the original
+single-file app, so ``streamlit run app.py`` keeps working with no setup.
+"""
+import os
+import tomllib
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def _endpoints_file(path):
+    if not path:
+        return {}
+    with open(path, "rb") as f:
+        return tomllib.load(f)
+
+
+# Inference API
+API_URL = os.environ.get(
+    "DCB_API_URL",
+    "https://deciphering-cb-image-multithread-681020458300.europe-west1.run.app",
+)
+# Replicas of the API to balance across: a comma-separated DCB_API_URLS, or
+# a TOML file holding ``endpoints = ["https://...", ...]`` and optionally
+# ``strategy``. Without either, API_URL is the only endpoint.
+_ENDPOINTS = _endpoints_file(os.environ.get("DCB_ENDPOINTS_FILE", ""))
+API_URLS = (
+    [url.strip() for url in os.environ.get("DCB_API_URLS", "").split(",") if url.strip()]
+    or _ENDPOINTS.get("endpoints")
+    or [API_URL]
+)
+# "least_outstanding" or "ewma" (latency moving average times requests in flight)
+LB_STRATEGY = os.environ.get("DCB_LB_STRATEGY", _ENDPOINTS.get("strategy", "least_outstanding"))
+# Consecutive failures that eject an endpoint, and for how long
+CIRCUIT_FAILURES = _env_int("DCB_CIRCUIT_FAILURES", 3)
+CIRCUIT_COOLDOWN = _env_float("DCB_CIRCUIT_COOLDOWN", 30)
+# Ejected endpoints are probed with GET on this path every HEALTH_INTERVAL seconds.
+HEALTH_PATH = os.environ.get("DCB_HEALTH_PATH", "/")
+HEALTH_INTERVAL = _env_float("DCB_HEALTH_INTERVAL", 10)
+
+# "remote" calls the API above; "local" runs the classifiers in this process
+# (see deciphering.local), loading them from these model names or paths.
+BACKEND = os.environ.get("DCB_BACKEND", "remote").strip().lower()
+LOCAL_AGENT_MODEL = os.environ.get("DCB_LOCAL_AGENT_MODEL", "")
+LOCAL_SENTIMENT_MODEL = os.environ.get("DCB_LOCAL_SENTIMENT_MODEL", "")
+LOCAL_BATCH_SIZE = _env_int("DCB_LOCAL_BATCH_SIZE", 64)
+# Torch device index for the local models; -1 is the CPU.
+LOCAL_DEVICE = _env_int("DCB_LOCAL_DEVICE", -1)
+
+# Result cache
+CACHE_MAX_ENTRIES = _env_int("DCB_CACHE_MAX_ENTRIES", 256)
+CACHE_MAX_BYTES = _env_int("DCB_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+CACHE_TTL = _env_float("DCB_CACHE_TTL", 24 * 60 * 60)
+# Path of the SQLite file backing the cache; empty keeps it in memory only.
+CACHE_DB = os.environ.get("DCB_CACHE_DB", ".cache/results.sqlite3")
+
+# Per-sentence results, so only sentences not seen before are sent to the
+# backend. Kept much longer than whole documents: a sentence's scores only
+# change with the model (TTL 0 keeps them forever).
+SENTENCE_CACHE = _env_bool("DCB_SENTENCE_CACHE", True)
+SENTENCE_CACHE_MAX_ENTRIES = _env_int("DCB_SENTENCE_CACHE_MAX_ENTRIES", 100_000)
+SENTENCE_CACHE_TTL = _env_float("DCB_SENTENCE_CACHE_TTL", 0)
+SENTENCE_CACHE_DB = os.environ.get("DCB_SENTENCE_CACHE_DB", ".cache/sentences.sqlite3")
+
+# HTTP client
+HTTP_POOL_SIZE = _env_int("DCB_HTTP_POOL_SIZE", 10)
+HTTP_CONNECT_TIMEOUT = _env_float("DCB_HTTP_CONNECT_TIMEOUT", 5)
+HTTP_READ_TIMEOUT = _env_float("DCB_HTTP_READ_TIMEOUT", 300)
+HTTP_RETRIES = _env_int("DCB_HTTP_RETRIES", 3)
+HTTP_RETRY_BACKOFF = _env_float("DCB_HTTP_RETRY_BACKOFF", 0.5)
+# Gzip request bodies at least this large; 0 sends them uncompressed.
+HTTP_GZIP_MIN_BYTES = _env_int("DCB_HTTP_GZIP_MIN_BYTES", 0)
+
+# Download URL inputs in the app and send their text to /predict, instead of
+# /predict_by_url. Pages are revalidated against a local HTTP cache and their
+# text is extracted in this many worker processes (0: in the calling thread).
+CLIENT_FETCH = _env_bool("DCB_CLIENT_FETCH", False)
+HTTP_CACHE_DB = os.environ.get("DCB_HTTP_CACHE_DB", ".cache/http.sqlite3")
+EXTRACT_WORKERS = _env_int("DCB_EXTRACT_WORKERS", 2)
+
+# Batch mode
+BATCH_CONCURRENCY = _env_int("DCB_BATCH_CONCURRENCY", 4)
+
+# Long texts are split into sentence-aligned chunks of at most this many
+# UTF-8 bytes and scored in parallel.
+CHUNK_MAX_BYTES = _env_int("DCB_CHUNK_MAX_BYTES", 16384)
+CHUNK_CONCURRENCY = _env_int("DCB_CHUNK_CONCURRENCY", 4)
+
+# Directory of the local Parquet archive and its index; empty disables it.
+ARCHIVE_DIR = os.environ.get("DCB_ARCHIVE_DIR", "archive")
+
+# Background jobs for URL analyses (needs a remote backend exposing /jobs;
+# not used when the app fetches URLs itself)
+URL_JOBS = _env_bool("DCB_URL_JOBS", False) and BACKEND == "remote" and not CLIENT_FETCH
+# How long Analyze waits for a job before leaving it to the jobs panel.
+JOB_WAIT_SECONDS = _env_float("DCB_JOB_WAIT_SECONDS", 20)
+JOB_LONG_POLL_SECONDS = _env_float("DCB_JOB_LONG_POLL_SECONDS", 10)
+JOB_REFRESH_SECONDS = _env_float("DCB_JOB_REFRESH_SECONDS", 3)
+# Pending jobs older than this are given up on and recorded as failed.
+JOB_MAX_AGE_SECONDS = _env_float("DCB_JOB_MAX_AGE_SECONDS", 24 * 60 * 60)
+
+# Metrics: Prometheus text served at /metrics on this port (0 disables it),
+# and/or rewritten to this file after every analysis (empty disables it).
+METRICS_PORT = _env_int("DCB_METRICS_PORT", 0)
+METRICS_FILE = os.environ.get("DCB_METRICS_FILE", "")
+# Per-stage timing of the last analysis in the sidebar
+DEBUG_PANEL = _env_bool("DCB_DEBUG_PANEL", False)
+
+# Result tables are filtered, sorted and paged server-side; the browser gets
+# one page of this many rows at a time.
+RESULT_PAGE_SIZE = _env_int("DCB_RESULT_PAGE_SIZE", 100)
+
+# Serialized exports kept in memory for repeated downloads
+EXPORT_CACHE_MAX_BYTES = _env_int("DCB_EXPORT_CACHE_MAX_BYTES", 256 * 1024 * 1024)
+
+# Watch-list monitor (python -m deciphering.monitor)
+WATCHLIST_FILE = os.environ.get("DCB_WATCHLIST_FILE", "watchlist.toml")
+MONITOR_INTERVAL = _env_float("DCB_MONITOR_INTERVAL", 900)
+MONITOR_CONCURRENCY = _env_int("DCB_MONITOR_CONCURRENCY", 4)
+# Latest monitored publications on Home: how many, and how often the list refreshes
+LATEST_COUNT = _env_int("DCB_LATEST_COUNT", 10)
+LATEST_REFRESH_SECONDS = _env_float("DCB_LATEST_REFRESH_SECONDS", 60)
+
+# Search page: full-text and facet index of every archived sentence, kept in
+# the archive directory; at most this many results per query, and facet
+# counts of a text query over at most this many of its newest matches.
+SEARCH_LIMIT = _env_int("DCB_SEARCH_LIMIT", 1000)
+SEARCH_FACET_LIMIT = _env_int("DCB_SEARCH_FACET_LIMIT", 50_000)
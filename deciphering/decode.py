@@ -0,0 +1,26 @@
+"""JSON codec for API requests, responses and cached results.
+
+Responses are parsed straight from the raw bytes, with orjson when it is
+installed and the standard library otherwise. Text is kept as sent: accents
+and currency signs in ECB or Banque de France statements survive intact.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def loads(data):
+    """Parse JSON from ``bytes`` or ``str`` without an intermediate decode."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """Serialize ``obj`` to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
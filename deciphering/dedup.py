@@ -0,0 +1,150 @@
+"""Sentence-level reuse of earlier results.
+
+Successive statements from the same central bank repeat most of their
+sentences. ``iter_deduplicated`` looks every sentence of a text up in a
+sentence cache (a ``ResultCache`` keyed by ``sentence_key``), sends only the
+sentences it has not seen to the backend and stitches cached and new rows
+back together in document order, so the work grows with what changed rather
+than with the length of the document.
+
+The unseen sentences are sent as they appear in the text, each with the
+whitespace that follows it, so consecutive ones reach the backend unchanged.
+The backend splits what it receives into sentences itself, and its rows are
+matched back to the sentences they came from by comparing their text with
+whitespace removed. A sentence the backend returns no row for (too short to
+be significant) is cached as having none. A row that runs on over several of
+our sentences (the backend did not split after "U.S.", say) is placed where
+the first of them was and none of them are cached. If the rows cannot be
+matched at all, the rest of the document from the first sentence not yet
+returned is scored again as it is, without the cache, so rows always come in
+document order.
+"""
+from deciphering.cache import normalize_text, sentence_key
+from deciphering.chunking import sentence_spans
+from deciphering.metrics import stage
+
+
+def _compact(text):
+    return "".join(normalize_text(text).split())
+
+
+class _Aligner:
+    """Assign the backend's rows, as they arrive, to the unseen sentences they belong to."""
+
+    def __init__(self, unseen):
+        self.unseen = unseen  # [(key, sentence)] in document order
+        self.resolved = {}  # rows of every sentence matched so far
+        self.scored = {}  # the ones scored on their own, which can be cached
+        self.misaligned = False
+        self._index = 0  # first and last sentence covered by the rows in ``_rows``
+        self._end = 0
+        self._rows = []
+        self._remaining = _compact(unseen[0][1]) if unseen else ""
+
+    def _resolve(self):
+        keys = [key for key, _ in self.unseen[self._index:self._end + 1]]
+        self.resolved[keys[0]] = self._rows
+        for key in keys[1:]:
+            self.resolved[key] = []
+        if len(keys) == 1:
+            self.scored[keys[0]] = self._rows
+        self._index = self._end = self._end + 1
+        self._rows = []
+        self._remaining = _compact(self.unseen[self._index][1]) if self._index < len(self.unseen) else ""
+
+    def add(self, row):
+        if self.misaligned:
+            return
+        text = _compact(row[0])
+        start = self._index
+        while text and self._index < len(self.unseen):
+            if self._remaining.startswith(text):
+                self._rows.append(row)
+                self._remaining = self._remaining[len(text):]
+                if not self._remaining:
+                    self._resolve()
+                return
+            if text.startswith(self._remaining) and self._end + 1 < len(self.unseen):
+                # The row runs on into the next sentence.
+                text = text[len(self._remaining):]
+                self._end += 1
+                self._remaining = _compact(self.unseen[self._end][1])
+                continue
+            if self._rows or self._end > self._index:
+                break
+            # No row for this sentence: the backend skipped it.
+            self._resolve()
+        # The row matches no upcoming sentence, so those were not skipped after all.
+        for key, _ in self.unseen[start:self._index]:
+            del self.resolved[key]
+            self.scored.pop(key, None)
+        self.misaligned = True
+
+    def finish(self):
+        """Mark the sentences the backend never returned a row for as having none."""
+        while not self.misaligned and self._index < len(self.unseen):
+            if self._rows:
+                self.misaligned = True
+            else:
+                self._resolve()
+
+
+def iter_deduplicated(text, cache, stream):
+    """Yield batches of rows for ``text``, scoring only the sentences missing from ``cache``.
+
+    ``stream(text)`` yields batches of rows from the backend. Rows are
+    yielded in document order as soon as every sentence before them is
+    known; newly scored sentences are added to ``cache`` at the end.
+    """
+    with stage("parse"):
+        spans = sentence_spans(text)
+        plan = [(sentence_key(text[start:end]), text[start:end]) for start, end in spans]
+    # Each sentence with the whitespace up to the next one
+    pieces = [text[start:following] for (start, _), (following, _) in zip(spans, spans[1:] + [(len(text), 0)])]
+    known = {}
+    unseen = []
+    request = []
+    for (key, sentence), piece in zip(plan, pieces):
+        if key in known:
+            continue
+        rows = cache.get(key)
+        known[key] = rows
+        if rows is None:
+            unseen.append((key, sentence))
+            request.append(piece)
+
+    aligner = _Aligner(unseen)
+    position = 0
+
+    def ready():
+        nonlocal position
+        rows = []
+        while position < len(plan):
+            key = plan[position][0]
+            found = known[key] if known[key] is not None else aligner.resolved.get(key)
+            if found is None:
+                break
+            rows.extend(found)
+            position += 1
+        return rows
+
+    if unseen:
+        batches = stream("".join(request).strip())
+        for batch in batches:
+            for row in batch:
+                aligner.add(row)
+            if aligner.misaligned:
+                getattr(batches, "close", lambda: None)()
+                break
+            rows = ready()
+            if rows:
+                yield rows
+        aligner.finish()
+    rows = ready()
+    if rows:
+        yield rows
+    if aligner.misaligned and position < len(plan):
+        # The backend splits this text differently: score the rest of it as it is.
+        yield from stream(text[spans[position][0]:])
+    if aligner.scored:
+        cache.put_many(aligner.scored.items())
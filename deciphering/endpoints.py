@@ -0,0 +1,126 @@
+"""Load balancing and failover across replicas of the inference API.
+
+``EndpointPool`` tracks, for each base URL, the requests in flight, an
+exponentially weighted moving average of its latency and its recent
+failures. ``pick`` chooses the endpoint with the fewest outstanding requests
+(``least_outstanding``) or the lowest expected wait, latency EWMA times
+queue depth (``ewma``). After ``failure_threshold`` consecutive failures an
+endpoint's circuit opens and it is skipped for ``cooldown`` seconds; then it
+gets a single trial request, or a health check readmits it first.
+"""
+import random
+import threading
+import time
+
+STRATEGIES = ("least_outstanding", "ewma")
+
+
+class Endpoint:
+    def __init__(self, url):
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.latency = None  # EWMA in seconds, None until the first success
+        self.failures = 0
+        self.open_until = 0.0
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def ejected(self):
+        return self.open_until > time.monotonic()
+
+
+class EndpointPool:
+    def __init__(self, urls, strategy="least_outstanding", failure_threshold=3, cooldown=30.0, alpha=0.3):
+        if not urls:
+            raise ValueError("At least one endpoint URL is required.")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown load-balancing strategy {strategy!r}; use one of {', '.join(STRATEGIES)}.")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self._lock = threading.Lock()
+
+    def _cost(self, endpoint):
+        if self.strategy == "ewma":
+            # Unmeasured endpoints cost nothing, so each one gets tried early.
+            return (endpoint.latency or 0.0) * (endpoint.outstanding + 1)
+        return endpoint.outstanding
+
+    def pick(self, exclude=()):
+        """Reserve and return the best endpoint not in ``exclude``, or None if none is left.
+
+        If every remaining endpoint is ejected, the one closest to the end of
+        its cooldown is returned rather than failing outright.
+        """
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if endpoint not in exclude]
+            if not candidates:
+                return None
+            available = [endpoint for endpoint in candidates if not endpoint.ejected]
+            if available:
+                # Shuffle first so ties do not always go to the first endpoint.
+                random.shuffle(available)
+                endpoint = min(available, key=self._cost)
+            else:
+                endpoint = min(candidates, key=lambda endpoint: endpoint.open_until)
+            endpoint.outstanding += 1
+            return endpoint
+
+    def acquire(self, endpoint):
+        with self._lock:
+            endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint, elapsed=None, ok=True):
+        """Record the outcome of a request sent to ``endpoint``."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            endpoint.requests += 1
+            if ok:
+                endpoint.failures = 0
+                endpoint.open_until = 0.0
+                if elapsed is not None:
+                    previous = endpoint.latency
+                    endpoint.latency = elapsed if previous is None else previous + self.alpha * (elapsed - previous)
+            else:
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.failures >= self.failure_threshold:
+                    endpoint.open_until = time.monotonic() + self.cooldown
+
+    def check_health(self, session, path="/", timeout=2.0):
+        """Probe every endpoint whose circuit is open and readmit those that answer.
+
+        Any response below 500 counts as alive: the API need not have a
+        dedicated health route.
+        """
+        for endpoint in self.endpoints:
+            if endpoint.failures < self.failure_threshold:
+                continue
+            try:
+                alive = session.get(endpoint.url + path, timeout=timeout).status_code < 500
+            except Exception:
+                alive = False
+            with self._lock:
+                if alive:
+                    endpoint.failures = 0
+                    endpoint.open_until = 0.0
+                else:
+                    endpoint.open_until = time.monotonic() + self.cooldown
+
+    def stats(self):
+        with self._lock:
+            return [
+                {
+                    "url": endpoint.url,
+                    "requests": endpoint.requests,
+                    "errors": endpoint.errors,
+                    "outstanding": endpoint.outstanding,
+                    "latency": endpoint.latency,
+                    "ejected": endpoint.ejected,
+                }
+                for endpoint in self.endpoints
+            ]
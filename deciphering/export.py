@@ -0,0 +1,87 @@
+"""Downloadable exports of result tables as Parquet, Arrow IPC or gzipped CSV.
+
+Exports are written straight from the Arrow table that shares the result
+frame's buffers, into an in-memory Arrow output stream: the frame is never
+converted or copied on the way. The serialized bytes are kept per result and
+format in an ``ExportCache``, so repeated downloads of the same result, from
+any session, are served without writing it again.
+"""
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+# Label: (file extension, MIME type)
+FORMATS = {
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+}
+
+
+def write_export(table, export_format):
+    """Serialize a ``pyarrow.Table`` in one of ``FORMATS``; returns ``bytes``."""
+    sink = pa.BufferOutputStream()
+    if export_format == "Parquet":
+        pq.write_table(table, sink, compression="zstd")
+    elif export_format == "Arrow IPC":
+        # The IPC file format needs one dictionary per column across batches.
+        table = table.unify_dictionaries()
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif export_format == "CSV (gzip)":
+        with pa.CompressedOutputStream(sink, "gzip") as stream:
+            pa_csv.write_csv(table, stream)
+    else:
+        raise ValueError(f"Unknown export format: {export_format}")
+    return sink.getvalue().to_pybytes()
+
+
+class ExportCache:
+    """Serialized exports by ``(key, format)``, least recently used first out past ``max_bytes``.
+
+    Concurrent requests for the same export wait for one writer instead of
+    serializing the table twice.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._building = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, export_format, build_table):
+        """Return the export of ``build_table()``, writing it only if it is not cached."""
+        cache_key = (key, export_format)
+        with self._lock:
+            data = self._entries.get(cache_key)
+            if data is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return data
+            building = self._building.setdefault(cache_key, threading.Lock())
+        with building:
+            with self._lock:
+                data = self._entries.get(cache_key)
+                if data is not None:
+                    self.hits += 1
+                    return data
+                self.misses += 1
+            try:
+                data = write_export(build_table(), export_format)
+            finally:
+                with self._lock:
+                    self._building.pop(cache_key, None)
+            with self._lock:
+                if len(data) <= self.max_bytes:
+                    self._entries[cache_key] = data
+                    self.size += len(data)
+                    while self.size > self.max_bytes:
+                        _, evicted = self._entries.popitem(last=False)
+                        self.size -= len(evicted)
+            return data
@@ -0,0 +1,72 @@
+"""Plain-text extraction from uploaded or downloaded documents."""
+import io
+import os
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+_SKIPPED_TAGS = {"script", "style", "noscript", "head", "nav", "footer", "header", "aside", "form"}
+_BLOCK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6", "section", "article"}
+
+
+class _TextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIPPED_TAGS:
+            self._skipping += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIPPED_TAGS and self._skipping:
+            self._skipping -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+
+def html_to_text(html):
+    parser = _TextParser()
+    parser.feed(html)
+    parser.close()
+    lines = (" ".join(line.split()) for line in "".join(parser.parts).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def pdf_to_text(data):
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ValueError("PDF support requires the 'pypdf' package (pip install pypdf).")
+    reader = PdfReader(io.BytesIO(data))
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def decode_bytes(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def extract_text(filename, data):
+    """Return the text of an uploaded file, dispatching on its extension."""
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".pdf":
+        return pdf_to_text(data)
+    if extension in (".html", ".htm"):
+        return html_to_text(decode_bytes(data))
+    return decode_bytes(data)
+
+
+def extract_download(url, content_type, data):
+    """Return the text of a downloaded document, dispatching on its Content-Type, then on the URL."""
+    content_type = content_type.lower()
+    filename = "document.pdf" if "pdf" in content_type else "document.html" if "html" in content_type else url
+    return extract_text(urlsplit(filename).path or filename, data)
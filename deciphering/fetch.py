@@ -0,0 +1,147 @@
+"""Client-side download and text extraction of URL inputs.
+
+Instead of asking the backend to fetch a page (``/predict_by_url``), the app
+can download it itself and send the extracted text to ``/predict``. Every
+download is revalidated against a local HTTP cache with ``If-None-Match`` /
+``If-Modified-Since``: a page that has not changed costs a ``304`` and reuses
+the text extracted last time, which then hits the result cache instead of
+the model. HTML and PDF extraction is CPU-bound pure Python, so it runs in a
+small process pool rather than on the threads serving the app.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+from urllib.request import url2pathname
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from deciphering.cache import url_key
+from deciphering.extract import decode_bytes, extract_download
+from deciphering.metrics import stage
+
+
+class HttpCache:
+    """Validators and extracted text of fetched pages, keyed by canonical URL, in SQLite."""
+
+    def __init__(self, path=None):
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages "
+            "(key TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, text TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        self._db.commit()
+
+    def get(self, url):
+        """Return ``{"etag", "last_modified", "text", "fetched_at"}`` for ``url`` or None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, text, fetched_at FROM pages WHERE key = ?", (url_key(url),)
+            ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(("etag", "last_modified", "text", "fetched_at"), row))
+
+    def put(self, url, text, etag=None, last_modified=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages (key, etag, last_modified, text, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url_key(url), etag, last_modified, text, time.time()),
+            )
+            self._db.commit()
+
+    def touch(self, url):
+        with self._lock:
+            self._db.execute("UPDATE pages SET fetched_at = ? WHERE key = ?", (time.time(), url_key(url)))
+            self._db.commit()
+
+
+class PageFetcher:
+    """Download pages with conditional GETs and extract their text in a process pool.
+
+    ``extract_workers=0`` extracts in the calling thread instead.
+    """
+
+    def __init__(self, cache, timeout=(5, 60), pool_size=10, extract_workers=2, user_agent=None):
+        self.cache = cache
+        self.timeout = timeout
+        self.extract_workers = extract_workers
+        self.downloads = 0
+        self.not_modified = 0
+        self.downloaded_bytes = 0
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if user_agent:
+            self.session.headers["User-Agent"] = user_agent
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _extract(self, url, content_type, data):
+        if not self.extract_workers:
+            return extract_download(url, content_type, data)
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking the app server, with its threads, is not safe
+                self._pool = concurrent.futures.ProcessPoolExecutor(
+                    self.extract_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+        return self._pool.submit(extract_download, url, content_type, data).result()
+
+    def fetch_text(self, url, extract=True):
+        """Return the main text of ``url``, downloading it only if it changed since the last fetch.
+
+        With ``extract=False`` the decoded body is returned as is (for feeds).
+        ``file://`` URLs are read from disk, for local stand-ins of real sources.
+        """
+        url = url.strip()
+        if urlsplit(url).scheme == "file":
+            with open(url2pathname(urlsplit(url).path), "rb") as f:
+                data = f.read()
+            return self._extract(url, "", data) if extract else decode_bytes(data)
+        cached = self.cache.get(url)
+        headers = {}
+        if cached is not None:
+            if cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+        with stage("network"):
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            data = response.content
+        if response.status_code == 304 and cached is not None:
+            with self._lock:
+                self.not_modified += 1
+            self.cache.touch(url)
+            return cached["text"]
+        response.raise_for_status()
+        with self._lock:
+            self.downloads += 1
+            self.downloaded_bytes += len(data)
+        with stage("parse"):
+            text = self._extract(url, response.headers.get("Content-Type", ""), data) if extract else response.text
+        self.cache.put(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return text
+
+    def stats(self):
+        with self._lock:
+            return {
+                "downloads": self.downloads,
+                "not_modified": self.not_modified,
+                "downloaded_bytes": self.downloaded_bytes,
+            }
+
+    def close(self):
+        self.session.close()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
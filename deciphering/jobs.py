@@ -0,0 +1,70 @@
+"""Background analysis jobs.
+
+A backend that exposes ``/jobs`` can fetch and score a long URL on its own
+time: the client submits the URL, gets a job id back and polls (or long-polls)
+for the status until the result can be downloaded. Job states:
+``queued`` -> ``running`` -> ``done`` | ``failed``.
+
+Submitted jobs are also kept in the archive index, so any later session can
+collect them. A job the backend no longer knows (404/410, e.g. after a
+restart) or that is still pending after ``JOB_MAX_AGE_SECONDS`` is given up
+on and recorded as failed.
+"""
+import datetime
+import time
+
+TERMINAL_STATUSES = ("done", "failed")
+GONE_STATUS_CODES = (404, 410)
+
+
+def is_finished(status):
+    return status.get("status") in TERMINAL_STATUSES
+
+
+def wait_for_job(client, job_id, timeout, long_poll=10, min_interval=1.0, on_status=None):
+    """Poll ``job_id`` until it finishes or ``timeout`` seconds pass; return the last status.
+
+    Each poll asks the backend to hold the request for up to ``long_poll``
+    seconds. Backends that answer straight away are polled at most once per
+    ``min_interval`` seconds. ``on_status`` is called with every status seen.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        started = time.monotonic()
+        remaining = deadline - started
+        status = client.job_status(job_id, wait=max(0, min(long_poll, remaining)))
+        if on_status is not None:
+            on_status(status)
+        if is_finished(status) or time.monotonic() >= deadline:
+            return status
+        time.sleep(max(0.0, min(min_interval - (time.monotonic() - started), deadline - time.monotonic())))
+
+
+def job_gone(error):
+    """True if ``error`` says the backend does not know the job (any more)."""
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in GONE_STATUS_CODES
+
+
+def job_age(job):
+    """Seconds since ``job`` (a dict with an ISO ``submitted_at``) was submitted."""
+    submitted = datetime.datetime.fromisoformat(job["submitted_at"])
+    return (datetime.datetime.now() - submitted).total_seconds()
+
+
+def finish_job(client, job_id, status, store=None, save=None):
+    """Collect a finished job: returns its rows, or None if it failed.
+
+    ``save(rows)`` archives the result and returns its document id. An error
+    fetching the result propagates before anything is recorded, so the job
+    stays pending and a later poll collects it.
+    """
+    if status["status"] == "failed":
+        if store is not None:
+            store.update_job(job_id, "failed", error=status.get("error"))
+        return None
+    rows = client.job_result(job_id)
+    document_id = save(rows) if save is not None else None
+    if store is not None:
+        store.update_job(job_id, "done", document_id=document_id)
+    return rows
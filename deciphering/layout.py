@@ -0,0 +1,109 @@
+"""Page setup shared by every page: configuration, CSS, sidebar logo and banner.
+
+Only Streamlit and the asset manifest are needed here, so the light pages
+(FAQs, About) render without importing pandas, pyarrow or the HTTP client.
+"""
+import streamlit as st
+
+from deciphering.assets import load_image_bytes, picture_html
+
+CSS = """
+    <style>
+    .stApp {
+        background-color: #2F2F2F;
+        font-family: 'Arial', sans-serif;
+    }
+    .title {
+        text-align: center;
+        font-size: 36px;
+        color: #FFFFFF;
+    }
+    .description {
+        text-align: center;
+        font-size: 18px;
+        color: #D3D3D3;
+    }
+    .sidebar .sidebar-content {
+        background-color: #000000;
+        color: #FFFFFF;
+        text-align: center;
+    }
+    .css-1d391kg {
+        padding: 10px;
+    }
+    .st-emotion-cache-1gwvy71 {
+    padding: 20px 6.5rem 6rem;
+    }
+    .st-emotion-cache-12fmjuu {
+    position: fixed;
+    top: 0px;
+    left: 0px;
+    right: 0px;
+    height: 3.75rem;
+    background: #000000;
+    outline: none;
+    z-index: 999990;
+    display: block;
+    }
+    h2, h3, h4 {
+        color: #D3D3D3;
+    }
+    .stButton>button {
+        background-color: #808080;
+        color: white;
+        border: none;
+        padding: 10px 20px;
+        font-size: 16px;
+        border-radius: 5px;
+        cursor: pointer;
+    }
+    .stButton>button:hover {
+        background-color: #A9A9A9;
+    }
+    .dataframe {
+        background-color: #333333;
+        color: #FFFFFF;
+    }
+    </style>
+    """
+
+
+def setup_page():
+    # Page configuration
+    st.set_page_config(page_title="Deciphering Central Banks - Text & URL Analysis", layout="wide", page_icon="📊")
+    # CSS
+    st.markdown(CSS, unsafe_allow_html=True)
+
+
+# Images: pre-built variants from `make assets` when present, else the resized originals
+@st.cache_data(show_spinner=False)
+def get_image(path, max_width):
+    return load_image_bytes(path, max_width)
+
+
+@st.cache_data(show_spinner=False)
+def get_picture(name, sizes, width=None):
+    return picture_html(name, sizes, width=width)
+
+
+def show_banner(warning="Banner image not found. Please ensure the image is in the correct path."):
+    picture = get_picture("DALL.E_Banner.jpg", "100vw")
+    if picture:
+        st.markdown(picture, unsafe_allow_html=True)
+        return
+    try:
+        st.image(get_image("Resources/DALL.E_Banner.jpg", 1600), width="stretch")
+    except FileNotFoundError:
+        st.warning(warning)
+
+
+def show_sidebar_logo():
+    picture = get_picture("DALL.E_Logo_NoBKG.png", "120px", width=120)
+    if picture:
+        st.sidebar.markdown(picture, unsafe_allow_html=True)
+        return
+    try:
+        # Twice the display width, for high-DPI screens
+        st.sidebar.image(get_image("Resources/DALL.E_Logo_NoBKG.png", 240), width=120)
+    except FileNotFoundError:
+        st.sidebar.warning("Small logo not found. Please ensure the image is in the correct path.")
@@ -0,0 +1,87 @@
+"""In-process inference, as an alternative to the remote API.
+
+``LocalInferenceEngine`` has the same ``predict_*``/``stream_*`` methods as
+``InferenceClient`` and returns the same five-column rows, so the app can use
+either one as its backend (``DCB_BACKEND=local`` or ``remote``). It splits the
+text into sentences itself and scores them with the agent and sentiment
+classifiers in batches, which removes the network hop and the service's cold
+starts. Loading the models is the expensive part: build one engine per
+process and share it.
+"""
+import threading
+
+import requests
+
+from deciphering.chunking import split_sentences
+from deciphering.extract import extract_download
+
+
+class LocalInferenceEngine:
+    """Score sentences with two classifiers held in memory.
+
+    ``agent_classifier`` and ``sentiment_classifier`` take a list of strings
+    and return one ``{"label", "score"}`` dict per string, like a Hugging Face
+    text-classification pipeline.
+    """
+
+    def __init__(self, agent_classifier, sentiment_classifier, batch_size=64, fetch_timeout=(5, 60)):
+        self.agent_classifier = agent_classifier
+        self.sentiment_classifier = sentiment_classifier
+        self.batch_size = batch_size
+        self.fetch_timeout = fetch_timeout
+        self.session = requests.Session()
+        # The models already use every core; concurrent calls would only contend.
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_pretrained(cls, agent_model, sentiment_model, batch_size=64, device=-1, **kwargs):
+        """Load both classifiers with ``transformers``; ``device=-1`` runs them on CPU."""
+        try:
+            from transformers import pipeline
+        except ImportError:
+            raise ValueError(
+                "The local backend requires the 'transformers' and 'torch' packages "
+                "(pip install transformers torch)."
+            )
+        if not agent_model or not sentiment_model:
+            raise ValueError("Set DCB_LOCAL_AGENT_MODEL and DCB_LOCAL_SENTIMENT_MODEL to use the local backend.")
+        options = {"device": device, "batch_size": batch_size, "truncation": True}
+        return cls(
+            pipeline("text-classification", model=agent_model, **options),
+            pipeline("text-classification", model=sentiment_model, **options),
+            batch_size=batch_size,
+            **kwargs,
+        )
+
+    def _score(self, sentences):
+        with self._lock:
+            agents = self.agent_classifier(sentences)
+            sentiments = self.sentiment_classifier(sentences)
+        return [
+            [sentence, agent["label"], float(agent["score"]), sentiment["label"], float(sentiment["score"])]
+            for sentence, agent, sentiment in zip(sentences, agents, sentiments)
+        ]
+
+    def _fetch_text(self, url):
+        response = self.session.get(url, timeout=self.fetch_timeout)
+        response.raise_for_status()
+        return extract_download(url, response.headers.get("Content-Type", ""), response.content)
+
+    def stream_text(self, text):
+        """Yield rows one batch of ``batch_size`` sentences at a time."""
+        sentences = [sentence.strip() for sentence in split_sentences(str(text))]
+        for start in range(0, len(sentences), self.batch_size):
+            yield self._score(sentences[start:start + self.batch_size])
+
+    def stream_url(self, url):
+        """Download ``url``, extract its text and score it like ``stream_text``."""
+        yield from self.stream_text(self._fetch_text(url))
+
+    def predict_text(self, text):
+        return [row for rows in self.stream_text(text) for row in rows]
+
+    def predict_url(self, url):
+        return [row for rows in self.stream_url(url) for row in rows]
+
+    def close(self):
+        self.session.close()
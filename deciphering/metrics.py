@@ -0,0 +1,207 @@
+"""Per-stage timing of analyses and Prometheus-style metrics.
+
+Code on the hot path wraps each step in ``stage(name)`` (or reports an
+already measured duration with ``record``). Every measurement feeds the
+process-wide ``METRICS`` registry: a ``dcb_stage_seconds`` histogram per
+stage, next to a few counters. While an analysis runs inside
+``trace()``, the same measurements are also summed into that analysis's
+``Trace``, which the debug panel shows. The trace follows the work into
+worker threads as long as they are started with ``propagate``.
+
+``METRICS.render()`` produces the Prometheus text format. It can be written
+to a file for a node-exporter textfile collector (``write_file``) or served
+at ``/metrics`` (``start_http_server``).
+"""
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STAGES = ("request build", "network", "decode", "parse", "frame build", "render")
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current_trace = contextvars.ContextVar("dcb_trace", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def _label_key(labels):
+    # Label values are compared when rendering, so a status code and "error" must both be strings
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class Registry:
+    """Thread-safe counters and histograms keyed by name and label values."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self._help = {}
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, value, **labels):
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * len(self.buckets), 0, 0.0]
+            counts = histogram[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            histogram[1] += 1
+            histogram[2] += value
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in self._histograms.items())
+        lines = []
+        described = set()
+
+        def header(name, kind):
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            header(name, "counter")
+            lines.append(f"{name}{_labels(labels)} {value}")
+        for (name, labels), (counts, count, total) in histograms:
+            header(name, "histogram")
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {bucket_count}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+            lines.append(f"{name}_sum{_labels(labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Atomically replace ``path`` with the current metrics."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path + ".tmp", "w") as f:
+            f.write(self.render())
+        os.replace(path + ".tmp", path)
+
+
+METRICS = Registry()
+METRICS.describe("dcb_stage_seconds", "Time spent in each stage of an analysis.")
+METRICS.describe("dcb_analysis_seconds", "Wall time of an analysis, from click to rendered result.")
+METRICS.describe("dcb_analyses_total", "Analyses run, by input kind and outcome.")
+METRICS.describe("dcb_backend_requests_total", "Requests sent to the inference backend, by HTTP status.")
+METRICS.describe("dcb_result_cache_total", "Result cache lookups, by outcome.")
+
+
+class Trace:
+    """Stage durations of one analysis, summed across the threads that worked on it."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self.stages = {}
+        self.calls = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+            self.calls[stage] = self.calls.get(stage, 0) + 1
+
+    @property
+    def total(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def breakdown(self):
+        """``[(stage, milliseconds, calls)]`` in pipeline order, then any other stages."""
+        with self._lock:
+            order = [stage for stage in STAGES if stage in self.stages]
+            order += [stage for stage in self.stages if stage not in STAGES]
+            return [(stage, self.stages[stage] * 1000, self.calls[stage]) for stage in order]
+
+
+def record(stage, seconds):
+    METRICS.observe("dcb_stage_seconds", seconds, stage=stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add(stage, seconds)
+
+
+@contextlib.contextmanager
+def stage(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def trace(kind):
+    """Collect the stages of one analysis of input ``kind``; yields its ``Trace``."""
+    current = Trace()
+    token = _current_trace.set(current)
+    outcome = "error"
+    try:
+        yield current
+        outcome = "ok"
+    finally:
+        _current_trace.reset(token)
+        current.finished = time.perf_counter()
+        METRICS.observe("dcb_analysis_seconds", current.total, kind=kind)
+        METRICS.inc("dcb_analyses_total", kind=kind, outcome=outcome)
+
+
+def propagate(function):
+    """Wrap ``function`` to run in a copy of the caller's context, so a worker thread keeps its trace.
+
+    A context can only be entered by one thread at a time: wrap once per task.
+    """
+    context = contextvars.copy_context()
+    return lambda *args, **kwargs: context.run(function, *args, **kwargs)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_http_server(port, host="127.0.0.1"):
+    """Serve ``/metrics`` from a daemon thread; returns the server."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
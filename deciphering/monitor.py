@@ -0,0 +1,229 @@
+"""Background monitor that scores new and revised publications from a watch list.
+
+Runs as its own process, next to the Streamlit app::
+
+    python -m deciphering.monitor                 # poll every ``interval`` seconds
+    python -m deciphering.monitor --once          # one pass, e.g. from cron
+
+The watch list is a TOML file (``DCB_WATCHLIST_FILE``)::
+
+    interval = 900
+
+    [[feeds]]
+    url = "https://www.example.org/press/feed.xml"
+    source = "ecb"
+    max_items = 20
+
+Each feed is an RSS, Atom or sitemap document (``file://`` URLs work too, for
+local stand-ins). Every linked page is fetched through the app's page fetcher
+(conditional GETs against the HTTP cache) and hashed; only pages whose text
+is new or changed since the last pass are scored, through the same backend
+client, caches and sentence reuse as the app, and written to the archive.
+The Home page then shows these results without running the model, and each
+pass adds them to the search index too.
+"""
+import argparse
+import datetime
+import email.utils
+import logging
+import time
+import tomllib
+import xml.etree.ElementTree as ElementTree
+
+from deciphering import config
+from deciphering.backend import (
+    create_client,
+    create_page_fetcher,
+    create_result_cache,
+    create_result_store,
+    create_search_index,
+    create_sentence_cache,
+    iter_score_text,
+)
+from deciphering.batch import run_batch
+from deciphering.cache import canonical_url, text_key
+from deciphering.results import rows_to_frame
+from deciphering.store import source_from_url
+
+logger = logging.getLogger(__name__)
+
+
+def load_watchlist(path):
+    """Read the watch list: ``{"interval": seconds, "feeds": [{"url", "source", "max_items"}]}``."""
+    with open(path, "rb") as f:
+        watchlist = tomllib.load(f)
+    feeds = []
+    for feed in watchlist.get("feeds", []):
+        if "url" not in feed:
+            raise ValueError(f"{path}: every [[feeds]] entry needs a url")
+        feeds.append({
+            "url": feed["url"],
+            "source": feed.get("source") or source_from_url(feed["url"]),
+            "max_items": int(feed.get("max_items", 20)),
+        })
+    return {"interval": float(watchlist.get("interval", config.MONITOR_INTERVAL)), "feeds": feeds}
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(element, name):
+    for child in element:
+        if _local_name(child.tag) == name:
+            return (child.text or "").strip()
+    return ""
+
+
+def _parse_date(value):
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value[:10])
+    except ValueError:
+        pass
+    try:
+        return email.utils.parsedate_to_datetime(value).date()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_feed(xml_text):
+    """Items of an RSS, Atom or sitemap document as ``[{"url", "title", "date"}]``, in feed order."""
+    root = ElementTree.fromstring(xml_text)
+    items = []
+    for element in root.iter():
+        name = _local_name(element.tag)
+        if name == "item":  # RSS
+            url = _child_text(element, "link")
+            date = _child_text(element, "pubDate") or _child_text(element, "date")
+        elif name == "entry":  # Atom
+            links = [child for child in element if _local_name(child.tag) == "link"]
+            alternate = [link for link in links if link.get("rel", "alternate") == "alternate"]
+            url = (alternate or links or [ElementTree.Element("link")])[0].get("href", "")
+            date = _child_text(element, "updated") or _child_text(element, "published")
+        elif name == "url":  # sitemap
+            url = _child_text(element, "loc")
+            date = _child_text(element, "lastmod")
+        else:
+            continue
+        if url:
+            items.append({"url": url, "title": _child_text(element, "title") or url, "date": _parse_date(date)})
+    return items
+
+
+class Monitor:
+    def __init__(
+        self, feeds, client, fetcher, store, result_cache=None, sentence_cache=None, max_workers=4, search_index=None
+    ):
+        self.feeds = feeds
+        self.client = client
+        self.fetcher = fetcher
+        self.store = store
+        self.result_cache = result_cache
+        self.sentence_cache = sentence_cache
+        self.max_workers = max_workers
+        self.search_index = search_index
+
+    def _score(self, text):
+        cache_key = text_key(text)
+        rows = self.result_cache.get(cache_key) if self.result_cache is not None else None
+        if rows is None:
+            rows = [row for batch in iter_score_text(self.client, text, self.sentence_cache) for row in batch]
+            if rows and self.result_cache is not None:
+                self.result_cache.put(cache_key, rows)
+        return rows
+
+    def check(self, item):
+        """Score ``item`` if its text changed since the last pass.
+
+        Returns ``"new"``, ``"changed"`` or ``"unchanged"``.
+        """
+        url = canonical_url(item["url"])
+        text = self.fetcher.fetch_text(item["url"])
+        content_hash = text_key(text)
+        previous = self.store.watched_hash(url)
+        if previous == content_hash:
+            return "unchanged"
+        df = rows_to_frame(self._score(text))
+        document_id = None
+        if not df.empty:
+            # A revision replaces the previous version in the daily rollups
+            document_id = self.store.save(
+                df, content_hash, title=item["title"], kind="watch", source=item["source"],
+                date=item["date"], url=item["url"], supersedes=self.store.latest_watched(url),
+            )
+        self.store.save_watched(url, content_hash, document_id)
+        return "new" if previous is None else "changed"
+
+    def run_once(self):
+        """One pass over every feed; returns how many items were new, changed, unchanged or failed."""
+        counts = {"new": 0, "changed": 0, "unchanged": 0, "failed": 0}
+        items = []
+        for feed in self.feeds:
+            try:
+                entries = parse_feed(self.fetcher.fetch_text(feed["url"], extract=False))
+            except Exception as e:
+                logger.warning("Feed %s could not be read: %s", feed["url"], e)
+                counts["failed"] += 1
+                continue
+            for entry in entries[:feed["max_items"]]:
+                items.append((entry["url"], {**entry, "source": feed["source"]}))
+        for url, outcome, error in run_batch(items, self.check, max_workers=self.max_workers):
+            if error is not None:
+                logger.warning("%s could not be analysed: %s", url, error)
+                counts["failed"] += 1
+            else:
+                counts[outcome] += 1
+                if outcome != "unchanged":
+                    logger.info("%s %s", outcome.capitalize(), url)
+        if self.search_index is not None and (counts["new"] or counts["changed"]):
+            self.search_index.sync(self.store)
+        return counts
+
+    def run_forever(self, interval):
+        while True:
+            started = time.monotonic()
+            counts = self.run_once()
+            logger.info(
+                "Pass done in %.1fs: %d new, %d changed, %d unchanged, %d failed",
+                time.monotonic() - started, counts["new"], counts["changed"], counts["unchanged"], counts["failed"],
+            )
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def create_monitor(feeds):
+    """A ``Monitor`` wired to the backend, caches and archive configured for the app."""
+    store = create_result_store()
+    if store is None:
+        raise ValueError("The monitor writes to the archive: set DCB_ARCHIVE_DIR.")
+    return Monitor(
+        feeds,
+        create_client(),
+        create_page_fetcher(),
+        store,
+        result_cache=create_result_cache(),
+        sentence_cache=create_sentence_cache(),
+        max_workers=config.MONITOR_CONCURRENCY,
+        search_index=create_search_index(),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--watchlist", default=config.WATCHLIST_FILE, help="TOML watch list")
+    parser.add_argument("--once", action="store_true", help="run one pass and exit")
+    parser.add_argument("--interval", type=float, help="seconds between passes (default: from the watch list)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    watchlist = load_watchlist(args.watchlist)
+    monitor = create_monitor(watchlist["feeds"])
+    if args.once:
+        print(monitor.run_once())
+    else:
+        monitor.run_forever(args.interval or watchlist["interval"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Server-side filtering, sorting and paging of result tables.
+
+A ``ResultView`` keeps the full frame in the process and hands out one page
+at a time, so the browser only ever receives ``page_size`` rows however long
+the document is. Sorting uses stable argsort indexes computed once per column
+and direction when the view is built; filters are matched on categorical
+codes. The filtered, sorted row order of the last few queries is kept, so
+paging through a result only slices an index array.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+SORT_COLUMNS = ("Agent Probability", "Sentiment Probability")
+FILTER_COLUMNS = ("Agent", "Sentiment")
+
+
+class ResultView:
+    def __init__(self, df, max_orders=8):
+        self.df = df.reset_index(drop=True)
+        self.max_orders = max_orders
+        self._sort_index = {}
+        for column in SORT_COLUMNS:
+            values = self.df[column].to_numpy()
+            # Stable sorts both ways keep ties in document order.
+            self._sort_index[column, False] = np.argsort(values, kind="stable")
+            self._sort_index[column, True] = np.argsort(-values, kind="stable")
+        self._orders = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def labels(self, column):
+        return list(self.df[column].cat.categories)
+
+    def order(self, filters=None, sort=None, descending=True):
+        """Row positions matching ``filters`` (``{column: [labels]}``), sorted by ``sort``."""
+        filters = {column: tuple(values) for column, values in (filters or {}).items() if values}
+        key = (tuple(sorted(filters.items())), sort, descending)
+        with self._lock:
+            order = self._orders.get(key)
+            if order is not None:
+                self._orders.move_to_end(key)
+                return order
+        if sort is None:
+            order = np.arange(len(self.df))
+        else:
+            order = self._sort_index[sort, descending]
+        if filters:
+            mask = np.ones(len(self.df), dtype=bool)
+            for column, values in filters.items():
+                categories = self.df[column].cat.categories
+                codes = [categories.get_loc(value) for value in values if value in categories]
+                mask &= np.isin(self.df[column].cat.codes.to_numpy(), codes)
+            order = order[mask[order]]
+        with self._lock:
+            self._orders[key] = order
+            while len(self._orders) > self.max_orders:
+                self._orders.popitem(last=False)
+        return order
+
+    def page(self, number, page_size, filters=None, sort=None, descending=True):
+        """Rows of page ``number`` (0-based) and the number of matching rows."""
+        order = self.order(filters, sort, descending)
+        start = number * page_size
+        return self.df.iloc[order[start:start + page_size]], len(order)
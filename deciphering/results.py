@@ -0,0 +1,57 @@
+"""Typed, columnar model of an analysis result.
+
+Every result table in the app, whatever branch produced it, has the columns
+and dtypes of ``SCHEMA``: Arrow-backed strings for sentences, categoricals for
+the few distinct agent and sentiment labels and float32 probabilities. That
+keeps archives of hundreds of thousands of sentences small and lets
+``to_arrow``/``from_arrow`` hand buffers to pyarrow without copying them.
+"""
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+STRING = pd.StringDtype("pyarrow")
+
+SCHEMA = {
+    'Sentence': STRING,
+    'Agent': 'category',
+    'Agent Probability': np.dtype(np.float32),
+    'Sentiment': 'category',
+    'Sentiment Probability': np.dtype(np.float32),
+}
+RESULT_COLUMNS = list(SCHEMA)
+
+
+def rows_to_frame(rows):
+    """Build a result table from the API's list of ``[sentence, agent, p, sentiment, p]`` rows."""
+    columns = zip(*rows) if rows else [()] * len(SCHEMA)
+    data = {}
+    for (name, dtype), values in zip(SCHEMA.items(), columns):
+        if dtype == 'category':
+            data[name] = pd.Categorical(values)
+        elif isinstance(dtype, np.dtype):
+            data[name] = np.fromiter(values, dtype=dtype, count=len(rows))
+        else:
+            data[name] = pd.array(values, dtype=dtype)
+    return pd.DataFrame(data, copy=False)
+
+
+def conform(df):
+    """Cast a frame holding the result columns (plus any extra ones) to ``SCHEMA``."""
+    return df.astype({name: dtype for name, dtype in SCHEMA.items() if df[name].dtype != dtype})
+
+
+def _arrow_to_pandas_type(arrow_type):
+    if pa.types.is_large_string(arrow_type) or pa.types.is_string(arrow_type):
+        return STRING
+    return None
+
+
+def to_arrow(df):
+    """Convert a result table to a ``pyarrow.Table``; numeric and string buffers are shared."""
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def from_arrow(table):
+    """Convert a ``pyarrow.Table`` back to a result table without copying its buffers."""
+    return table.to_pandas(types_mapper=_arrow_to_pandas_type, split_blocks=True, self_destruct=False)
@@ -0,0 +1,265 @@
+"""Full-text and faceted search over every archived sentence.
+
+Sentences are copied from the archive into their own SQLite database next
+to it: a table with the facets (agent, sentiment, source, date and both
+probabilities) under B-tree indexes, and an FTS5 index over the sentence
+text. ``sync`` only adds documents archived since the last call, so keeping
+the index current costs as much as the new documents. Text queries rank
+matches with BM25; facet-only queries walk the indexes newest first.
+
+Facet counts without text or probability bounds come from a rollup of
+sentences per agent, sentiment, source and day, kept up to date by ``add``.
+Counts for a text query are taken over its newest ``limit`` matches, so a
+very common word costs no more than a rare one.
+"""
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+from deciphering.results import conform
+
+_TOKEN = re.compile(r"\w+\*?")
+
+# Result column: search column
+COLUMNS = {
+    'Sentence': 's.sentence',
+    'Agent': 's.agent',
+    'Agent Probability': 's.agent_probability',
+    'Sentiment': 's.sentiment',
+    'Sentiment Probability': 's.sentiment_probability',
+    'Source': 's.source',
+    'Date': 's.date',
+    'Title': 'd.title',
+    'Document': 'd.document_id',
+}
+FACETS = {'Agent': 'agent', 'Sentiment': 'sentiment', 'Source': 'source'}
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every word; a trailing ``*`` keeps prefix matching."""
+    terms = []
+    for token in _TOKEN.findall(text):
+        word = token.rstrip("*")
+        terms.append(f'"{word}"' + ("*" if token.endswith("*") else ""))
+    return " AND ".join(terms)
+
+
+class SearchIndex:
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        # The monitor process writes to the same file
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._db.executescript(
+            """
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS documents (
+                id INTEGER PRIMARY KEY,
+                document_id TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                url TEXT
+            );
+            CREATE TABLE IF NOT EXISTS sentences (
+                id INTEGER PRIMARY KEY,
+                document INTEGER NOT NULL,
+                sentence TEXT NOT NULL,
+                agent TEXT NOT NULL,
+                agent_probability REAL NOT NULL,
+                sentiment TEXT NOT NULL,
+                sentiment_probability REAL NOT NULL,
+                source TEXT NOT NULL,
+                date TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS sentences_facets ON sentences (agent, sentiment, source, date);
+            CREATE INDEX IF NOT EXISTS sentences_source_date ON sentences (source, date);
+            CREATE INDEX IF NOT EXISTS sentences_date ON sentences (date);
+            CREATE TABLE IF NOT EXISTS facet_values (
+                facet TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (facet, value)
+            );
+            CREATE TABLE IF NOT EXISTS facet_counts (
+                agent TEXT NOT NULL,
+                sentiment TEXT NOT NULL,
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                sentences INTEGER NOT NULL,
+                PRIMARY KEY (source, date, agent, sentiment)
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS sentences_fts USING fts5(
+                sentence, content='sentences', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+            );
+            """
+        )
+        self._db.commit()
+
+    def add(self, document_id, df, title, source, date, url=None):
+        """Index one result table; returns False if the document was already indexed."""
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                "INSERT OR IGNORE INTO documents (document_id, title, url) VALUES (?, ?, ?)", (document_id, title, url)
+            )
+            if cursor.rowcount == 0:
+                return False
+            document = cursor.lastrowid
+            first = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM sentences").fetchone()[0]
+            self._db.executemany(
+                "INSERT INTO sentences (id, document, sentence, agent, agent_probability, sentiment, "
+                "sentiment_probability, source, date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                zip(
+                    range(first, first + len(df)),
+                    [document] * len(df),
+                    df['Sentence'].tolist(),
+                    df['Agent'].astype(str).tolist(),
+                    df['Agent Probability'].tolist(),
+                    df['Sentiment'].astype(str).tolist(),
+                    df['Sentiment Probability'].tolist(),
+                    [source] * len(df),
+                    [str(date)] * len(df),
+                ),
+            )
+            self._db.execute(
+                "INSERT INTO sentences_fts (rowid, sentence) SELECT id, sentence FROM sentences WHERE id >= ?",
+                (first,),
+            )
+            self._db.executemany(
+                "INSERT OR IGNORE INTO facet_values (facet, value) VALUES (?, ?)",
+                [("agent", value) for value in df['Agent'].astype(str).unique()]
+                + [("sentiment", value) for value in df['Sentiment'].astype(str).unique()]
+                + [("source", source)],
+            )
+            counts = df.groupby([df['Agent'].astype(str), df['Sentiment'].astype(str)], observed=True).size()
+            self._db.executemany(
+                "INSERT INTO facet_counts (agent, sentiment, source, date, sentences) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, date, agent, sentiment) DO UPDATE SET sentences = sentences + excluded.sentences",
+                [(agent, sentiment, source, str(date), int(n)) for (agent, sentiment), n in counts.items()],
+            )
+        return True
+
+    def sync(self, store):
+        """Index the archived documents that are not indexed yet; returns how many were added."""
+        with self._lock:
+            indexed = {row[0] for row in self._db.execute("SELECT document_id FROM documents")}
+        added = 0
+        for row in store.list_documents().itertuples(index=False):
+            if row.id not in indexed:
+                added += self.add(row.id, store.load(row.id), row.title, row.source, row.date, row.url)
+        return added
+
+    def _filters(self, agents, sentiments, sources, since, until, agent_probability=(0.0, 1.0),
+                 sentiment_probability=(0.0, 1.0), table="s"):
+        clauses, params = [], []
+        for column, values in (("agent", agents), ("sentiment", sentiments), ("source", sources)):
+            if values:
+                clauses.append(f"{table}.{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        if since:
+            clauses.append(f"{table}.date >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append(f"{table}.date <= ?")
+            params.append(until.isoformat())
+        for column, (low, high) in (
+            ("agent_probability", agent_probability), ("sentiment_probability", sentiment_probability)
+        ):
+            if low > 0:
+                clauses.append(f"{table}.{column} >= ?")
+                params.append(low)
+            if high < 1:
+                clauses.append(f"{table}.{column} <= ?")
+                params.append(high)
+        return clauses, params
+
+    def search(
+        self, text="", agents=(), sentiments=(), sources=(), since=None, until=None,
+        agent_probability=(0.0, 1.0), sentiment_probability=(0.0, 1.0), limit=1000,
+    ):
+        """Matching sentences as a result table with Source, Date, Title and Document columns.
+
+        Text matches come best first (BM25); otherwise newest first.
+        """
+        clauses, params = self._filters(
+            agents, sentiments, sources, since, until, agent_probability, sentiment_probability
+        )
+        select = ", ".join(f'{column} AS "{name}"' for name, column in COLUMNS.items())
+        match = fts_query(text)
+        if match:
+            where = " AND ".join(["sentences_fts MATCH ?", *clauses])
+            params = [match, *params]
+            query = (
+                f"SELECT {select} FROM sentences_fts JOIN sentences s ON s.id = sentences_fts.rowid "
+                f"JOIN documents d ON d.id = s.document WHERE {where} ORDER BY sentences_fts.rank LIMIT ?"
+            )
+        else:
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            query = (
+                f"SELECT {select} FROM sentences s JOIN documents d ON d.id = s.document {where} "
+                "ORDER BY s.date DESC, s.id LIMIT ?"
+            )
+        with self._lock:
+            df = pd.read_sql_query(query, self._db, params=[*params, int(limit)])
+        return conform(df)
+
+    def facets(
+        self, text="", agents=(), sentiments=(), sources=(), since=None, until=None,
+        agent_probability=(0.0, 1.0), sentiment_probability=(0.0, 1.0), limit=50_000,
+    ):
+        """Number of matching sentences per agent, sentiment and source.
+
+        Returns ``({facet: Series}, complete)``; ``complete`` is False when a
+        text query had more than ``limit`` matches and only the newest were counted.
+        """
+        match = fts_query(text)
+        complete = True
+        if match or tuple(agent_probability) != (0.0, 1.0) or tuple(sentiment_probability) != (0.0, 1.0):
+            clauses, params = self._filters(
+                agents, sentiments, sources, since, until, agent_probability, sentiment_probability
+            )
+            if match:
+                clauses.insert(0, (
+                    "s.id IN (SELECT rowid FROM sentences_fts WHERE sentences_fts MATCH ? "
+                    "ORDER BY rowid DESC LIMIT ?)"
+                ))
+                params[:0] = [match, int(limit)]
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            query = f"SELECT s.agent, s.sentiment, s.source, COUNT(*) FROM sentences s {where} GROUP BY 1, 2, 3"
+        else:
+            clauses, params = self._filters(agents, sentiments, sources, since, until, table="f")
+            where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+            query = (
+                f"SELECT f.agent, f.sentiment, f.source, SUM(f.sentences) FROM facet_counts f {where} "
+                "GROUP BY 1, 2, 3"
+            )
+        with self._lock:
+            rows = pd.DataFrame(self._db.execute(query, params).fetchall(), columns=[*FACETS, 'Sentences'])
+            if match:
+                matches = self._db.execute(
+                    "SELECT COUNT(*) FROM (SELECT rowid FROM sentences_fts WHERE sentences_fts MATCH ? LIMIT ?)",
+                    (match, int(limit) + 1),
+                ).fetchone()[0]
+                complete = matches <= limit
+        counts = {
+            name: rows.groupby(name)['Sentences'].sum().astype('int64').sort_values(ascending=False)
+            for name in FACETS
+        }
+        return counts, complete
+
+    def values(self, column):
+        """Distinct values of a facet column, for the filter widgets."""
+        with self._lock:
+            cursor = self._db.execute(
+                "SELECT value FROM facet_values WHERE facet = ? ORDER BY value", (FACETS[column],)
+            )
+            return [row[0] for row in cursor]
+
+    def stats(self):
+        with self._lock:
+            documents = self._db.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            sentences = self._db.execute("SELECT COALESCE(MAX(id), 0) FROM sentences").fetchone()[0]
+        return {"documents": documents, "sentences": sentences}
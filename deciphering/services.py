@@ -0,0 +1,141 @@
+"""Process-wide resources and the cached analysis calls used by the Home and History pages.
+
+Every resource is built once per process with ``st.cache_resource`` and
+shared by all sessions; this module (and with it pandas, pyarrow and the
+HTTP client) is only imported by the pages that analyse or list documents.
+"""
+import streamlit as st
+
+from deciphering import config
+from deciphering.backend import (
+    create_client,
+    create_page_fetcher,
+    create_result_cache,
+    create_result_store,
+    create_search_index,
+    create_sentence_cache,
+    iter_score_text,
+)
+from deciphering.cache import text_key, url_key
+from deciphering.export import ExportCache
+from deciphering.metrics import METRICS
+from deciphering.singleflight import SingleFlight
+
+
+# Inference backend, shared by every session of this process: the API client,
+# or the classifiers themselves, loaded once
+@st.cache_resource
+def get_client():
+    return create_client()
+
+
+# Client-side download of URL inputs, or None to let the backend fetch them
+@st.cache_resource
+def get_page_fetcher():
+    return create_page_fetcher() if config.CLIENT_FETCH else None
+
+
+# Result cache, shared by every session of this process
+@st.cache_resource
+def get_result_cache():
+    return create_result_cache()
+
+
+# Sentence-level results, shared by every session of this process
+@st.cache_resource
+def get_sentence_cache():
+    return create_sentence_cache()
+
+
+# Local archive of every analysed document
+@st.cache_resource
+def get_result_store():
+    return create_result_store()
+
+
+# Full-text and facet index of the archived sentences
+@st.cache_resource
+def get_search_index():
+    return create_search_index()
+
+
+# Archived results never change once written, so each is read from disk once
+@st.cache_resource(max_entries=32, show_spinner=False)
+def load_archived(document_id):
+    return get_result_store().load(document_id)
+
+
+# Serialized downloads, shared by every session of this process
+@st.cache_resource
+def get_export_cache():
+    return ExportCache(max_bytes=config.EXPORT_CACHE_MAX_BYTES)
+
+
+# Identical analyses running at the same time in different sessions share one backend call
+@st.cache_resource
+def get_single_flight():
+    return SingleFlight()
+
+
+# Cached calls to the API, yielding rows as they arrive
+def cache_rows(cache_key, batches):
+    result = []
+    for rows in batches:
+        result.extend(rows)
+        yield rows
+    if result != []:
+        get_result_cache().put(cache_key, result)
+
+
+def lookup(cache_key):
+    result = get_result_cache().get(cache_key)
+    METRICS.inc("dcb_result_cache_total", result="miss" if result is None else "hit")
+    return result
+
+
+def iter_analyze_text(text):
+    cache_key = text_key(text)
+    result = lookup(cache_key)
+    if result is not None:
+        yield result
+        return
+    client = get_client()
+    sentence_cache = get_sentence_cache()
+    yield from get_single_flight().stream(
+        cache_key, lambda: cache_rows(cache_key, iter_score_text(client, text, sentence_cache))
+    )
+
+
+def iter_analyze_url(url):
+    fetcher = get_page_fetcher()
+    if fetcher is not None:
+        # Revalidated on every analysis: an unchanged page costs a 304 and a
+        # result cache hit on its text, a changed one is scored again
+        yield from iter_analyze_text(fetcher.fetch_text(url))
+        return
+    cache_key = url_key(url)
+    result = lookup(cache_key)
+    if result is not None:
+        yield result
+        return
+    client = get_client()
+    yield from get_single_flight().stream(cache_key, lambda: cache_rows(cache_key, client.stream_url(url)))
+
+
+def analyze_text(text):
+    return [row for rows in iter_analyze_text(text) for row in rows]
+
+
+def analyze_url(url):
+    return [row for rows in iter_analyze_url(url) for row in rows]
+
+
+def archive(df, input_key, title, kind, source, date, url=None):
+    result_store = get_result_store()
+    if result_store is None or df is None or df.empty:
+        return None
+    try:
+        return result_store.save(df, input_key, title=title, kind=kind, source=source, date=date, url=url)
+    except Exception as e:
+        st.warning(f"Results could not be archived: {str(e)}")
+        return None
@@ -0,0 +1,76 @@
+"""Process-wide coalescing of identical in-flight analyses.
+
+When several sessions ask for the same document at once, only the first one
+starts a backend call; the others attach to it and receive the same rows.
+The call runs in its own thread, so it finishes (and fills the result cache)
+even if the session that started it reruns or goes away, and every attached
+caller still sees the rows stream in batch by batch.
+"""
+import threading
+
+from deciphering.metrics import propagate
+
+
+class _Flight:
+    def __init__(self):
+        self.batches = []
+        self.done = False
+        self.error = None
+        self.changed = threading.Condition()
+
+
+class SingleFlight:
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def stream(self, key, produce):
+        """Yield the batches of ``produce()``, sharing one call among concurrent callers with the same key.
+
+        ``produce`` returns an iterable of batches. It should store its result
+        where later callers will find it (the result cache) before it ends:
+        once it finishes, a new call with the same key starts a new flight.
+        If it raises, every attached caller gets the error.
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                # The call keeps the starting session's timing trace.
+                threading.Thread(target=propagate(self._run), args=(key, flight, produce), daemon=True).start()
+            else:
+                self.shared += 1
+        seen = 0
+        while True:
+            with flight.changed:
+                flight.changed.wait_for(lambda: len(flight.batches) > seen or flight.done)
+                batches = flight.batches[seen:]
+                finished = flight.done
+            seen += len(batches)
+            yield from batches
+            if finished:
+                if flight.error is not None:
+                    raise flight.error
+                return
+
+    def _run(self, key, flight, produce):
+        try:
+            for batch in produce():
+                with flight.changed:
+                    flight.batches.append(batch)
+                    flight.changed.notify_all()
+        except Exception as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                del self._flights[key]
+            with flight.changed:
+                flight.done = True
+                flight.changed.notify_all()
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
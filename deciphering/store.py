@@ -0,0 +1,358 @@
+"""Append-only local archive of analysed documents.
+
+Each result table is written once as a zstd-compressed Parquet file under a
+Hive-style ``source=<source>/date=<YYYY-MM-DD>/`` partition, and a row
+describing it goes into a small SQLite index next to the files. Listing and
+filtering past analyses only touches the index; reloading one reads a single
+Parquet file, so neither needs the inference API. Background jobs whose
+results have not been collected yet are tracked in the same index, and so
+is the content hash of every page the watch-list monitor follows.
+
+Each saved document also adds its per-agent totals to a daily rollup
+(``daily_sentiment``) in the same transaction, which the sentiment time
+series read instead of the per-sentence results. A document that replaces an
+earlier one (the same text archived again, or a revised publication) takes
+the earlier one's totals out of the rollup in that transaction, so every
+text is counted once.
+"""
+import datetime
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from urllib.parse import urlsplit
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from deciphering.results import from_arrow, to_arrow
+from deciphering.timeseries import document_rollup
+
+_UNSAFE = re.compile(r"[^a-z0-9._-]+")
+
+
+def source_from_url(url):
+    """Use the host name, without ``www.``, as the source of a URL."""
+    host = (urlsplit(url.strip()).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host or "unknown"
+
+
+def _partition_value(value):
+    return _UNSAFE.sub("_", value.strip().lower()).strip("_") or "unknown"
+
+
+class ResultStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(root, "index.sqlite3"), check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                input_key TEXT NOT NULL,
+                title TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                url TEXT,
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                analysed_at TEXT NOT NULL,
+                sentences INTEGER NOT NULL,
+                path TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS documents_source_date ON documents (source, date);
+            CREATE INDEX IF NOT EXISTS documents_input_key ON documents (input_key);
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                document_id TEXT,
+                submitted_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS watched (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                document_id TEXT,
+                checked_at TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS daily_sentiment (
+                source TEXT NOT NULL,
+                date TEXT NOT NULL,
+                agent TEXT NOT NULL,
+                documents INTEGER NOT NULL,
+                sentences INTEGER NOT NULL,
+                positive INTEGER NOT NULL,
+                net_sum REAL NOT NULL,
+                PRIMARY KEY (source, date, agent)
+            );
+            """
+        )
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(documents)")]
+        if "rolled_up" not in columns:
+            # Archives from before the rollups: backfill_rollups() adds their documents
+            self._db.execute("ALTER TABLE documents ADD COLUMN rolled_up INTEGER NOT NULL DEFAULT 0")
+        if "superseded_by" not in columns:
+            self._db.execute("ALTER TABLE documents ADD COLUMN superseded_by TEXT")
+        self._db.commit()
+
+    def save(self, df, input_key, title, kind, source, date=None, url=None, supersedes=None):
+        """Archive a result table and return its document id.
+
+        A document whose ``input_key`` is already archived for the same date is
+        not written twice; the existing id is returned instead. Earlier
+        documents with the same ``input_key``, and the document ``supersedes``
+        (the previous version of a revised publication), leave the rollups.
+        """
+        date = (date or datetime.date.today()).isoformat()
+        source = _partition_value(source)
+        with self._lock:
+            existing = self._db.execute(
+                "SELECT id FROM documents WHERE input_key = ? AND date = ?", (input_key, date)
+            ).fetchone()
+            if existing is not None:
+                return existing[0]
+            previous = self._db.execute(
+                "SELECT id, source, date, path FROM documents WHERE (input_key = ? OR id = ?) AND rolled_up = 1",
+                (input_key, supersedes),
+            ).fetchall()
+        previous = [
+            (previous_id, previous_source, previous_date, self._read_rollup(path))
+            for previous_id, previous_source, previous_date, path in previous
+        ]
+        document_id = uuid.uuid4().hex
+        relative_path = os.path.join(f"source={source}", f"date={date}", f"{document_id}.parquet")
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        pq.write_table(to_arrow(df), path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+        rollup = document_rollup(df)
+        with self._lock:
+            for previous_id, previous_source, previous_date, previous_rollup in previous:
+                cursor = self._db.execute(
+                    "UPDATE documents SET rolled_up = 0, superseded_by = ? WHERE id = ? AND rolled_up = 1",
+                    (document_id, previous_id),
+                )
+                if cursor.rowcount:
+                    self._add_rollup(previous_source, previous_date, previous_rollup, sign=-1)
+            self._add_rollup(source, date, rollup)
+            self._db.execute(
+                "INSERT INTO documents "
+                "(id, input_key, title, kind, url, source, date, analysed_at, sentences, path, rolled_up) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)",
+                (
+                    document_id,
+                    input_key,
+                    title,
+                    kind,
+                    url,
+                    source,
+                    date,
+                    datetime.datetime.now().isoformat(timespec="seconds"),
+                    len(df),
+                    relative_path,
+                ),
+            )
+            self._db.commit()
+        return document_id
+
+    def _read_rollup(self, path):
+        columns = ["Agent", "Sentiment", "Sentiment Probability"]
+        return document_rollup(from_arrow(pq.read_table(os.path.join(self.root, path), columns=columns)))
+
+    def _add_rollup(self, source, date, rollup, sign=1):
+        """Add a document's rollup to the daily totals, or take it out with ``sign=-1``."""
+        self._db.executemany(
+            "INSERT INTO daily_sentiment (source, date, agent, documents, sentences, positive, net_sum) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (source, date, agent) DO UPDATE SET "
+            "documents = documents + excluded.documents, sentences = sentences + excluded.sentences, "
+            "positive = positive + excluded.positive, net_sum = net_sum + excluded.net_sum",
+            [
+                (source, date, agent, sign, sign * sentences, sign * positive, sign * net_sum)
+                for agent, sentences, positive, net_sum in rollup
+            ],
+        )
+        if sign < 0:
+            self._db.execute("DELETE FROM daily_sentiment WHERE documents <= 0")
+
+    def backfill_rollups(self):
+        """Add documents archived before the daily rollups existed; returns how many were added."""
+        with self._lock:
+            pending = self._db.execute(
+                "SELECT id, source, date, path FROM documents WHERE rolled_up = 0 AND superseded_by IS NULL"
+            ).fetchall()
+        for document_id, source, date, path in pending:
+            rollup = self._read_rollup(path)
+            with self._lock:
+                self._add_rollup(source, date, rollup)
+                self._db.execute("UPDATE documents SET rolled_up = 1 WHERE id = ?", (document_id,))
+                self._db.commit()
+        return len(pending)
+
+    def rollup_version(self):
+        """Changes whenever the rollups change; use it to key caches of ``daily_sentiment``."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM documents WHERE rolled_up = 1 OR superseded_by IS NOT NULL"
+            ).fetchone()[0]
+
+    def daily_sentiment(self, sources=None, agents=None, since=None, until=None):
+        """Daily rollup rows (source, date, agent, documents, sentences, positive, net_sum) matching the filters."""
+        clauses, params = [], []
+        if sources:
+            clauses.append(f"source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if agents:
+            clauses.append(f"agent IN ({', '.join('?' * len(agents))})")
+            params.extend(agents)
+        if since:
+            clauses.append("date >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append("date <= ?")
+            params.append(until.isoformat())
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return pd.read_sql_query(
+                "SELECT source, date, agent, documents, sentences, positive, net_sum "
+                f"FROM daily_sentiment {where} ORDER BY date",
+                self._db,
+                params=params,
+            )
+
+    def agents(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT agent FROM daily_sentiment ORDER BY agent")]
+
+    def list_documents(self, sources=None, since=None, until=None, title=None, kind=None, limit=None):
+        """Return the index rows matching every given filter, newest first."""
+        clauses, params = [], []
+        if kind:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if sources:
+            clauses.append(f"source IN ({', '.join('?' * len(sources))})")
+            params.extend(sources)
+        if since:
+            clauses.append("date >= ?")
+            params.append(since.isoformat())
+        if until:
+            clauses.append("date <= ?")
+            params.append(until.isoformat())
+        if title:
+            clauses.append("title LIKE ?")
+            params.append(f"%{title}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return pd.read_sql_query(
+                f"SELECT id, title, kind, url, source, date, analysed_at, sentences FROM documents {where} "
+                "ORDER BY date DESC, analysed_at DESC" + (f" LIMIT {int(limit)}" if limit else ""),
+                self._db,
+                params=params,
+            )
+
+    def sources(self):
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT source FROM documents ORDER BY source")]
+
+    def save_job(self, job_id, url, source, date=None):
+        """Remember a submitted background job so it survives the session."""
+        now = datetime.datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (id, url, source, date, status, submitted_at, updated_at) "
+                "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                (job_id, url, source, (date or datetime.date.today()).isoformat(), now, now),
+            )
+            self._db.commit()
+
+    def update_job(self, job_id, status, error=None, document_id=None):
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET status = ?, error = ?, document_id = COALESCE(?, document_id), updated_at = ? "
+                "WHERE id = ?",
+                (status, error, document_id, datetime.datetime.now().isoformat(timespec="seconds"), job_id),
+            )
+            self._db.commit()
+
+    def claim_job(self, job_id):
+        """Mark a pending job as being collected; False if another session got to it first."""
+        with self._lock:
+            cursor = self._db.execute(
+                "UPDATE jobs SET status = 'collecting', updated_at = ? "
+                "WHERE id = ? AND status NOT IN ('collecting', 'done', 'failed')",
+                (datetime.datetime.now().isoformat(timespec="seconds"), job_id),
+            )
+            self._db.commit()
+            return cursor.rowcount == 1
+
+    def list_jobs(self, pending_only=True):
+        """Jobs as dicts, oldest first; by default only those without a stored result."""
+        where = "WHERE status NOT IN ('done', 'failed')" if pending_only else ""
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT id, url, source, date, status, error, document_id, submitted_at FROM jobs {where} "
+                "ORDER BY submitted_at"
+            )
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def watched_hash(self, url):
+        """Content hash of ``url`` when the monitor last scored it, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT content_hash FROM watched WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def save_watched(self, url, content_hash, document_id=None):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO watched (url, content_hash, document_id, checked_at) VALUES (?, ?, ?, ?)",
+                (url, content_hash, document_id, datetime.datetime.now().isoformat(timespec="seconds")),
+            )
+            self._db.commit()
+
+    def latest_watched(self, url):
+        """Id of the latest result the monitor stored for ``url``, or None."""
+        with self._lock:
+            row = self._db.execute("SELECT document_id FROM watched WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def load(self, document_id):
+        """Read one archived result table back."""
+        with self._lock:
+            row = self._db.execute("SELECT path FROM documents WHERE id = ?", (document_id,)).fetchone()
+        if row is None:
+            raise KeyError(document_id)
+        return from_arrow(pq.read_table(os.path.join(self.root, row[0])))
+
+    def read_documents(self, document_ids):
+        """All sentences of the given documents as one ``pyarrow.Table``, tagged with their index fields.
+
+        The Parquet files are read as Arrow and concatenated chunk by chunk,
+        without going through pandas.
+        """
+        placeholders = ", ".join("?" * len(document_ids))
+        with self._lock:
+            cursor = self._db.execute(
+                f"SELECT id, title, source, date, path FROM documents WHERE id IN ({placeholders})", list(document_ids)
+            )
+            rows = {row[0]: row[1:] for row in cursor}
+        tables = []
+        for document_id in document_ids:
+            if document_id not in rows:
+                continue
+            title, source, date, path = rows[document_id]
+            table = pq.read_table(os.path.join(self.root, path)).replace_schema_metadata(None)
+            for name, value in (("Document", document_id), ("Title", title), ("Source", source), ("Date", date)):
+                table = table.append_column(name, pa.repeat(value, len(table)).dictionary_encode())
+            tables.append(table)
+        if not tables:
+            return pa.table({})
+        return pa.concat_tables(tables, promote_options="permissive")
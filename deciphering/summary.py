@@ -0,0 +1,57 @@
+"""Aggregate views of a result table.
+
+All figures are computed with vectorized group-bys on the typed result frame
+(see ``deciphering.results``); nothing loops over sentences in Python.
+"""
+import numpy as np
+import pandas as pd
+
+
+def sentiment_sign(labels):
+    """+1 for positive, -1 for negative and 0 for any other sentiment label."""
+    labels = labels.astype('category')
+    names = labels.cat.categories.str.lower()
+    signs = np.where(names.str.startswith('pos'), 1.0, np.where(names.str.startswith('neg'), -1.0, 0.0))
+    # Missing labels have code -1, which picks the trailing 0.
+    return np.append(signs, 0.0)[labels.cat.codes.to_numpy()]
+
+
+def sentiment_by_agent(df):
+    """Per agent: sentence count, share positive and probability-weighted net sentiment in [-1, 1]."""
+    sign = sentiment_sign(df['Sentiment'])
+    scored = pd.DataFrame({
+        'Agent': df['Agent'],
+        'Net Sentiment': sign * df['Sentiment Probability'].to_numpy(dtype=np.float64),
+        'Positive Share': sign > 0,
+    })
+    grouped = scored.groupby('Agent', observed=True)
+    summary = grouped.agg(
+        Sentences=('Net Sentiment', 'size'),
+        **{'Positive Share': ('Positive Share', 'mean'), 'Net Sentiment': ('Net Sentiment', 'mean')},
+    )
+    return summary.sort_values('Sentences', ascending=False)
+
+
+def agent_distribution(df):
+    """Share of sentences attributed to each agent."""
+    return df['Agent'].value_counts(normalize=True, sort=True).rename('Share').to_frame()
+
+
+def confidence_histogram(df, bins=10):
+    """Sentence counts per probability bin for both classifiers."""
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    labels = [f"{low:.1f}–{high:.1f}" for low, high in zip(edges[:-1], edges[1:])]
+    counts = {
+        column: np.histogram(df[column].to_numpy(dtype=np.float64), bins=edges)[0]
+        for column in ('Agent Probability', 'Sentiment Probability')
+    }
+    return pd.DataFrame(counts, index=pd.Index(labels, name='Probability'))
+
+
+def summarize(df):
+    """Every aggregate the summary panel shows, as plain DataFrames."""
+    return {
+        'sentiment_by_agent': sentiment_by_agent(df),
+        'agent_distribution': agent_distribution(df),
+        'confidence_histogram': confidence_histogram(df),
+    }
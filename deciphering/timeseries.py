@@ -0,0 +1,87 @@
+"""Net sentiment over time, from daily rollups of the archive.
+
+Every archived document adds its per-agent totals to a daily rollup in the
+archive index (see ``ResultStore``): sentence count, positive sentences and
+the sum of probability-weighted signs. Charts read those few rows instead of
+the per-sentence results, so years of history aggregate in milliseconds.
+A windowed index is the windowed sum of weighted signs over the windowed sum
+of sentences, which matches the summary panel's net sentiment for a single
+document.
+"""
+import numpy as np
+import pandas as pd
+
+from deciphering.summary import sentiment_sign
+
+GROUPINGS = {"Bank": ["source"], "Agent": ["agent"], "Bank and agent": ["source", "agent"]}
+
+
+def document_rollup(df):
+    """``[(agent, sentences, positive, net_sum)]`` for one result table."""
+    sign = sentiment_sign(df['Sentiment'])
+    scored = pd.DataFrame({
+        'agent': df['Agent'].astype(str),
+        'positive': sign > 0,
+        'net_sum': sign * df['Sentiment Probability'].to_numpy(dtype=np.float64),
+    })
+    grouped = scored.groupby('agent', sort=True).agg(
+        sentences=('net_sum', 'size'), positive=('positive', 'sum'), net_sum=('net_sum', 'sum')
+    )
+    return [
+        (agent, int(row.sentences), int(row.positive), float(row.net_sum))
+        for agent, row in grouped.iterrows()
+    ]
+
+
+def _calendar(daily, by):
+    """Daily ``net_sum`` and ``sentences`` per group, with every calendar day present (zeros on empty days)."""
+    table = daily.assign(date=pd.to_datetime(daily['date'])).pivot_table(
+        index='date', columns=by, values=['net_sum', 'sentences'], aggfunc='sum', fill_value=0
+    )
+    days = pd.date_range(table.index.min(), table.index.max(), freq='D')
+    table = table.reindex(days, fill_value=0)
+    labels = [" · ".join(map(str, key)) if isinstance(key, tuple) else str(key) for key in table['net_sum'].columns]
+    net = pd.DataFrame(table['net_sum'].to_numpy(dtype=np.float64), index=days, columns=labels)
+    sentences = pd.DataFrame(table['sentences'].to_numpy(dtype=np.float64), index=days, columns=labels)
+    return net, sentences
+
+
+def sentiment_index(daily, grouping="Bank", window=30, min_sentences=1):
+    """Rolling net sentiment per group over ``window`` days, one column per group.
+
+    Days whose window holds fewer than ``min_sentences`` sentences are left empty.
+    """
+    if daily.empty:
+        return pd.DataFrame()
+    net, sentences = _calendar(daily, GROUPINGS[grouping])
+    net = net.rolling(f"{window}D").sum()
+    sentences = sentences.rolling(f"{window}D").sum()
+    index = net / sentences.where(sentences >= min_sentences)
+    index.index.name = 'Date'
+    return index
+
+
+def align_to_events(daily, event_dates, grouping="Agent", before=30, after=30):
+    """Net sentiment by day relative to each event, pooled over all events.
+
+    Returns one column per group, indexed by the offset in days from the
+    event (negative before it), and the number of events inside the data.
+    """
+    if daily.empty or not event_dates:
+        return pd.DataFrame(), 0
+    net, sentences = _calendar(daily, GROUPINGS[grouping])
+    start = net.index[0]
+    positions = np.array([(pd.Timestamp(date) - start).days for date in event_dates])
+    positions = positions[(positions + after >= 0) & (positions - before < len(net))]
+    if len(positions) == 0:
+        return pd.DataFrame(), 0
+    offsets = np.arange(-before, after + 1)
+    days = positions[:, None] + offsets[None, :]
+    inside = (days >= 0) & (days < len(net))
+    days = np.clip(days, 0, len(net) - 1)
+    # (events, offsets, groups), with days outside the data contributing nothing
+    pooled_net = (net.to_numpy()[days] * inside[..., None]).sum(axis=0)
+    pooled_sentences = (sentences.to_numpy()[days] * inside[..., None]).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profile = np.where(pooled_sentences > 0, pooled_net / pooled_sentences, np.nan)
+    return pd.DataFrame(profile, index=pd.Index(offsets, name='Days from event'), columns=net.columns), len(positions)
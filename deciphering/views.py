@@ -0,0 +1,200 @@
+"""Result widgets shared by the Home and History pages."""
+import math
+import time
+
+import streamlit as st
+
+from deciphering import config
+from deciphering.cache import rows_key
+from deciphering.export import FORMATS
+from deciphering.metrics import stage
+from deciphering.pager import FILTER_COLUMNS, SORT_COLUMNS, ResultView
+from deciphering.results import rows_to_frame, to_arrow
+from deciphering.services import (
+    get_export_cache,
+    get_page_fetcher,
+    get_result_cache,
+    get_sentence_cache,
+    get_single_flight,
+)
+from deciphering.summary import summarize
+
+
+# Progressive display of streamed results: the first page fills in as rows
+# arrive, then the full result is handed to the paged table. Returns the
+# frame and its key; without a ``result_key`` the key is a digest of the rows.
+def show_streamed_results(batches, result_key=None, refresh_seconds=0.25):
+    page_size = config.RESULT_PAGE_SIZE
+    start = time.perf_counter()
+    header, metrics, table = st.empty(), st.empty(), st.empty()
+    rows = []
+    first_row_ms = None
+    last_render = 0.0
+    for batch in batches:
+        if not batch:
+            continue
+        if first_row_ms is None:
+            first_row_ms = (time.perf_counter() - start) * 1000
+            header.markdown("### Analysis Results")
+        shown = min(len(rows), page_size)
+        rows.extend(batch)
+        if shown < page_size and time.perf_counter() - last_render >= refresh_seconds:
+            with stage("frame build"):
+                partial = rows_to_frame(rows[:page_size])
+            with stage("render"):
+                table.dataframe(partial)
+            last_render = time.perf_counter()
+    if rows == []:
+        st.error("Error: Text is not significant.")
+        return None, None
+    # Display table of results
+    with stage("frame build"):
+        df = rows_to_frame(rows)
+    if result_key is None:
+        result_key = rows_key(rows)
+    with table.container():
+        show_result_table(df, result_key)
+    total_ms = (time.perf_counter() - start) * 1000
+    with metrics.container(), stage("render"):
+        first_col, total_col, rows_col = st.columns(3)
+        first_col.metric("Time to first row", f"{first_row_ms:,.0f} ms")
+        total_col.metric("Total time", f"{total_ms:,.0f} ms")
+        rows_col.metric("Sentences", f"{len(rows):,}")
+    return df, result_key
+
+
+# Result tables stay in the process; each session only receives the page it looks at
+@st.cache_resource(max_entries=32, show_spinner=False)
+def get_result_view(result_key, _df):
+    return ResultView(_df)
+
+
+# Paging, filtering and sorting rerun only the table
+@st.fragment
+def show_result_table(df, result_key):
+    view = get_result_view(result_key, df)
+    key = f"results:{result_key}"
+    agent_col, sentiment_col, sort_col, order_col = st.columns([3, 2, 2, 1], vertical_alignment="bottom")
+    filters = {
+        column: widget_col.multiselect(f"{column}:", view.labels(column), key=f"{key}:{column}")
+        for column, widget_col in zip(FILTER_COLUMNS, (agent_col, sentiment_col))
+    }
+    sort = sort_col.selectbox(
+        "Sort by:", [None, *SORT_COLUMNS], format_func=lambda column: column or "Document order", key=f"{key}:sort"
+    )
+    descending = order_col.toggle("Descending", value=True, disabled=sort is None, key=f"{key}:descending")
+
+    page_size = config.RESULT_PAGE_SIZE
+    with stage("frame build"):
+        matching = len(view.order(filters, sort, descending))
+    pages = max(1, math.ceil(matching / page_size))
+    page_key = f"{key}:page"
+    if st.session_state.get(page_key, 1) > pages:
+        # The filters changed under the current page
+        st.session_state[page_key] = pages
+    with stage("frame build"):
+        page, _ = view.page(st.session_state.get(page_key, 1) - 1, page_size, filters, sort, descending)
+    with stage("render"):
+        st.dataframe(page)
+        caption_col, page_col = st.columns([4, 1], vertical_alignment="center")
+        page_col.number_input(
+            "Page", min_value=1, max_value=pages, key=page_key, label_visibility="collapsed"
+        )
+        first = (st.session_state.get(page_key, 1) - 1) * page_size
+        shown = f"Rows {first + 1:,}-{first + len(page):,} of {matching:,}" if matching else "No matching rows"
+        if matching != len(view):
+            shown += f" (filtered from {len(view):,})"
+        caption_col.caption(f"{shown} · page {st.session_state.get(page_key, 1)} of {pages}")
+    show_export_buttons(result_key, lambda: to_arrow(df), "analysis")
+
+
+# Download buttons; the file is written on click, in a separate thread, and
+# kept for the next download of the same result
+def show_export_buttons(export_key, build_table, file_stem):
+    export_cache = get_export_cache()
+    for column, (label, (extension, mime)) in zip(st.columns(len(FORMATS)), FORMATS.items()):
+        column.download_button(
+            label,
+            data=lambda label=label: export_cache.get(export_key, label, build_table),
+            file_name=f"{file_stem}.{extension}",
+            mime=mime,
+            on_click="ignore",
+            icon=":material/download:",
+            key=f"export:{export_key}:{extension}",
+        )
+
+
+# Summary panel, computed once per result and reused across reruns
+@st.cache_data(max_entries=64, show_spinner=False)
+def get_summary(result_key, _df):
+    return summarize(_df)
+
+
+def show_summary(df, result_key, remember=False):
+    if df is None or df.empty:
+        return
+    if remember:
+        # Keep the latest analysis on screen across reruns and page switches
+        st.session_state["last_result"] = (result_key, df)
+    with stage("summary"):
+        summary = get_summary(result_key, df)
+    with stage("render"):
+        show_summary_charts(summary)
+
+
+def show_summary_charts(summary):
+    st.markdown("#### Summary")
+    sentiment_col, agents_col = st.columns(2)
+    with sentiment_col:
+        st.caption("Probability-weighted net sentiment per economic agent (-1 negative, +1 positive)")
+        st.bar_chart(summary['sentiment_by_agent']['Net Sentiment'])
+        st.dataframe(summary['sentiment_by_agent'])
+    with agents_col:
+        st.caption("Share of sentences per economic agent")
+        st.bar_chart(summary['agent_distribution'])
+    st.caption("Classifier confidence (sentences per probability bin)")
+    st.bar_chart(summary['confidence_histogram'], stack=False)
+
+
+# Cache counters
+def show_cache_counters():
+    cache_stats = get_result_cache().stats()
+    flight_stats = get_single_flight().stats()
+    st.sidebar.markdown("---")
+    st.sidebar.caption(
+        f"Result cache: {cache_stats['hits']} hits ({cache_stats['disk_hits']} from disk), "
+        f"{cache_stats['misses']} misses, {cache_stats['entries']} entries. "
+        f"Backend calls: {flight_stats['calls']}, {flight_stats['shared']} shared with a concurrent session"
+    )
+    sentence_cache = get_sentence_cache()
+    if sentence_cache is not None:
+        sentence_stats = sentence_cache.stats()
+        looked_up = sentence_stats["hits"] + sentence_stats["misses"]
+        st.sidebar.caption(
+            f"Sentence cache: {sentence_stats['hits'] / looked_up if looked_up else 0:.0%} hit rate, "
+            f"{sentence_stats['misses']} of {looked_up} sentences sent for scoring"
+        )
+    fetcher = get_page_fetcher()
+    if fetcher is not None:
+        fetch_stats = fetcher.stats()
+        st.sidebar.caption(
+            f"Pages: {fetch_stats['downloads']} downloaded ({fetch_stats['downloaded_bytes'] / 1024:,.0f} KB), "
+            f"{fetch_stats['not_modified']} unchanged since the last fetch"
+        )
+
+
+# Timing breakdown of the latest analysis in this session (inside the analysis
+# fragment, next to the result it explains)
+def show_debug_panel():
+    last_trace = st.session_state.get("last_trace")
+    if last_trace is None:
+        return
+    with st.expander("Debug: timing of the last analysis"):
+        st.dataframe(
+            [{"Stage": name, "ms": round(ms, 1), "Calls": calls} for name, ms, calls in last_trace.breakdown()],
+            hide_index=True,
+        )
+        st.caption(
+            f"Wall time: {last_trace.total * 1000:,.0f} ms. Stages run by parallel workers "
+            "are summed, so they can add up to more than the wall time."
+        )
@@ -0,0 +1,28 @@
+import pytest
+import requests
+
+from benchmarks.stub_server import start_stub_server
+from deciphering.client import InferenceClient
+
+
+@pytest.fixture
+def slow_servers():
+    servers = [start_stub_server(latency=2.0) for _ in range(2)]
+    yield servers
+    for server in servers:
+        server.shutdown()
+
+
+def test_read_timeout_is_not_retried(slow_servers):
+    server = slow_servers[0]
+    client = InferenceClient(server.url, read_timeout=0.5, retries=3, backoff=0)
+    with pytest.raises(requests.Timeout):
+        client.predict_text("Rates rise.")
+    assert server.requests == 1
+
+
+def test_read_timeout_does_not_fail_over(slow_servers):
+    client = InferenceClient([server.url for server in slow_servers], read_timeout=0.5, retries=3, backoff=0)
+    with pytest.raises(requests.Timeout):
+        client.predict_text("Rates rise.")
+    assert sum(server.requests for server in slow_servers) == 1
@@ -0,0 +1,59 @@
+import re
+
+from deciphering.cache import ResultCache
+from deciphering.dedup import iter_deduplicated
+
+# Like a real sentence splitter, and unlike ``split_sentences``, this one does
+# not end a sentence after an abbreviation.
+_BACKEND_SENTENCE_END = re.compile(r"(?<!\bU\.S\.)(?<!\bMr\.)(?<=[.!?])\s+")
+
+
+class FakeBackend:
+    def __init__(self, transform=lambda sentence: sentence):
+        self.transform = transform
+        self.requests = []
+
+    def __call__(self, text):
+        self.requests.append(text)
+        for sentence in _BACKEND_SENTENCE_END.split(text.strip()):
+            if sentence:
+                yield [[self.transform(sentence), "households", 0.9, "positive", 0.8]]
+
+
+def analyse(text, cache, backend):
+    return [row[0] for batch in iter_deduplicated(text, cache, backend) for row in batch]
+
+
+TEXT = "The U.S. economy grew. Inflation eased. Mr. Smith said wages climbed. Rates held."
+
+
+def test_coarser_backend_keeps_document_order():
+    cache = ResultCache()
+    analyse("Inflation eased.", cache, FakeBackend())
+    backend = FakeBackend()
+    assert analyse(TEXT, cache, backend) == [
+        "The U.S. economy grew.", "Inflation eased.", "Mr. Smith said wages climbed.", "Rates held."
+    ]
+    # Only the unseen sentences were sent, unchanged, in one request
+    assert backend.requests == ["The U.S. economy grew. Mr. Smith said wages climbed. Rates held."]
+
+
+def test_sentences_split_differently_are_not_cached():
+    cache = ResultCache()
+    analyse(TEXT, cache, FakeBackend())
+    backend = FakeBackend()
+    assert analyse(TEXT, cache, backend) == [
+        "The U.S. economy grew.", "Inflation eased.", "Mr. Smith said wages climbed.", "Rates held."
+    ]
+    assert backend.requests == ["The U.S. economy grew. Mr. Smith said wages climbed."]
+
+
+def test_unmatched_rows_rescore_the_rest_in_order():
+    cache = ResultCache()
+    analyse("Inflation eased.", cache, FakeBackend())
+    # Rows that cannot be matched to the text that was sent
+    backend = FakeBackend(transform=lambda sentence: sentence.rstrip("."))
+    assert analyse(TEXT, cache, backend) == [
+        "The U.S. economy grew", "Inflation eased", "Mr. Smith said wages climbed", "Rates held"
+    ]
+    assert backend.requests[-1] == TEXT
@@ -0,0 +1,60 @@
+import datetime
+
+import pytest
+import requests
+
+from benchmarks.stub_server import score_text, start_stub_server
+from deciphering.client import InferenceClient
+from deciphering.jobs import finish_job, is_finished, job_age, job_gone, wait_for_job
+from deciphering.store import ResultStore
+
+
+@pytest.fixture
+def server():
+    server = start_stub_server(job_seconds=0.2)
+    yield server
+    server.shutdown()
+
+
+def test_submit_poll_and_collect(server, tmp_path):
+    client = InferenceClient(server.url, retries=0)
+    store = ResultStore(str(tmp_path))
+    url = "https://www.example.org/press/statement"
+    job_id = client.submit_url_job(url)
+    store.save_job(job_id, url, "example")
+
+    seen = []
+    status = wait_for_job(client, job_id, timeout=10, long_poll=1, min_interval=0.05, on_status=seen.append)
+    assert is_finished(status) and status["status"] == "done"
+    assert seen[-1] == status
+
+    assert store.claim_job(job_id)
+    assert not store.claim_job(job_id)  # another session
+    saved = []
+    rows = finish_job(client, job_id, status, store=store, save=lambda rows: saved.append(rows) or "doc-1")
+    assert rows == score_text(server.page_text(url)) == saved[0]
+    assert store.list_jobs() == []
+    assert store.list_jobs(pending_only=False)[0]["document_id"] == "doc-1"
+
+
+def test_result_errors_leave_the_job_pending(server, tmp_path):
+    client = InferenceClient(server.url, retries=0)
+    store = ResultStore(str(tmp_path))
+    store.save_job("deadbeef", "https://www.example.org/a", "example")
+    with pytest.raises(requests.HTTPError):
+        finish_job(client, "deadbeef", {"status": "done"}, store=store)
+    assert [job["id"] for job in store.list_jobs()] == ["deadbeef"]
+
+
+def test_unknown_jobs_are_gone(server, tmp_path):
+    client = InferenceClient(server.url, retries=0)
+    with pytest.raises(requests.HTTPError) as error:
+        client.job_status("deadbeef")
+    assert job_gone(error.value)
+    assert not job_gone(requests.ConnectionError())
+
+    store = ResultStore(str(tmp_path))
+    store.save_job("deadbeef", "https://www.example.org/a", "example")
+    job = store.list_jobs()[0]
+    assert 0 <= job_age(job) < 60
+    assert job_age({"submitted_at": (datetime.datetime.now() - datetime.timedelta(days=2)).isoformat()}) > 86400
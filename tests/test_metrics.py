@@ -0,0 +1,12 @@
+from deciphering.metrics import Registry
+
+
+def test_render_mixes_numeric_and_string_label_values():
+    registry = Registry()
+    registry.inc("dcb_api_requests_total", status=200)
+    registry.inc("dcb_api_requests_total", status="error")
+    registry.observe("dcb_api_request_seconds", 0.1, status=200)
+    registry.observe("dcb_api_request_seconds", 0.2, status="error")
+    text = registry.render()
+    assert 'dcb_api_requests_total{status="200"} 1' in text
+    assert 'dcb_api_requests_total{status="error"} 1' in text
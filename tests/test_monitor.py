@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from benchmarks.bench_monitor import write_feed, write_publication
+from benchmarks.stub_server import start_stub_server
+from deciphering.cache import ResultCache
+from deciphering.client import InferenceClient
+from deciphering.fetch import HttpCache, PageFetcher
+from deciphering.monitor import Monitor, load_watchlist, parse_feed
+from deciphering.store import ResultStore
+
+
+@pytest.fixture
+def server():
+    server = start_stub_server()
+    yield server
+    server.shutdown()
+
+
+def test_passes_score_only_new_and_changed_publications(server, tmp_path):
+    directory = str(tmp_path)
+    for index in range(3):
+        write_publication(directory, index, 5)
+    write_feed(directory, 3)
+    with open(os.path.join(directory, "watchlist.toml"), "w") as f:
+        f.write(f'interval = 60\n[[feeds]]\nurl = "file://{directory}/feed.xml"\nsource = "stand-in"\n')
+    watchlist = load_watchlist(os.path.join(directory, "watchlist.toml"))
+    assert watchlist["interval"] == 60 and watchlist["feeds"][0]["source"] == "stand-in"
+    store = ResultStore(os.path.join(directory, "archive"))
+    monitor = Monitor(
+        watchlist["feeds"],
+        InferenceClient(server.url),
+        PageFetcher(HttpCache(), extract_workers=0),
+        store,
+        result_cache=ResultCache(),
+        sentence_cache=ResultCache(max_entries=10_000),
+    )
+
+    def run_pass():
+        before = server.requests
+        counts = monitor.run_once()
+        return counts, server.requests - before
+
+    assert run_pass() == ({"new": 3, "changed": 0, "unchanged": 0, "failed": 0}, 3)
+    assert run_pass() == ({"new": 0, "changed": 0, "unchanged": 3, "failed": 0}, 0)
+
+    write_publication(directory, 0, 5, revision=1)
+    write_publication(directory, 3, 5)
+    write_feed(directory, 4)
+    assert run_pass() == ({"new": 1, "changed": 1, "unchanged": 2, "failed": 0}, 2)
+
+    documents = store.list_documents(kind="watch")
+    assert len(documents) == 5
+    # The revision replaced its first version in the daily rollups
+    assert store.daily_sentiment()["sentences"].sum() == 5 + 5 + 5 + 6
+    revised = store.load(store.latest_watched(f"file://{directory}/statement-0.html"))
+    assert revised["Sentence"].iloc[-1] == "This statement was corrected 1 times."
+
+
+def test_unreadable_feed_is_counted_as_failed(server, tmp_path):
+    monitor = Monitor(
+        [{"url": f"file://{tmp_path}/missing.xml", "source": "stand-in", "max_items": 20}],
+        InferenceClient(server.url),
+        PageFetcher(HttpCache(), extract_workers=0),
+        ResultStore(str(tmp_path / "archive")),
+    )
+    assert monitor.run_once() == {"new": 0, "changed": 0, "unchanged": 0, "failed": 1}
+
+
+def test_parse_feed_reads_rss_atom_and_sitemaps():
+    rss = "<rss><channel><item><title>A</title><link>https://x.org/a</link>" \
+          "<pubDate>Mon, 01 Sep 2025 14:00:00 GMT</pubDate></item></channel></rss>"
+    atom = "<feed xmlns='http://www.w3.org/2005/Atom'><entry><title>B</title>" \
+           "<link rel='alternate' href='https://x.org/b'/><updated>2025-09-02T10:00:00Z</updated></entry></feed>"
+    sitemap = "<urlset><url><loc>https://x.org/c</loc><lastmod>2025-09-03</lastmod></url></urlset>"
+    items = [item for xml in (rss, atom, sitemap) for item in parse_feed(xml)]
+    assert [(item["url"], item["title"], str(item["date"])) for item in items] == [
+        ("https://x.org/a", "A", "2025-09-01"),
+        ("https://x.org/b", "B", "2025-09-02"),
+        ("https://x.org/c", "https://x.org/c", "2025-09-03"),
+    ]
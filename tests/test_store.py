@@ -0,0 +1,50 @@
+import datetime
+
+from deciphering.results import rows_to_frame
+from deciphering.store import ResultStore
+
+DAY = datetime.date(2025, 9, 18)
+
+
+def frame(*sentiments):
+    return rows_to_frame([
+        [f"Sentence {i}.", "households", 0.9, sentiment, 0.8] for i, sentiment in enumerate(sentiments)
+    ])
+
+
+def totals(store):
+    daily = store.daily_sentiment()
+    return {
+        (row.source, row.date): (row.documents, row.sentences, row.positive, round(row.net_sum, 6))
+        for row in daily.itertuples(index=False)
+    }
+
+
+def test_rollups_add_each_document(tmp_path):
+    store = ResultStore(str(tmp_path))
+    store.save(frame("positive", "negative"), "text:a", "A", "text", "ecb", DAY)
+    store.save(frame("positive"), "text:b", "B", "text", "ecb", DAY)
+    assert totals(store) == {("ecb", "2025-09-18"): (2, 3, 2, 0.8)}
+
+
+def test_revised_publication_replaces_the_previous_version(tmp_path):
+    store = ResultStore(str(tmp_path))
+    first = store.save(frame("positive", "positive"), "text:v1", "Statement", "watch", "ecb", DAY)
+    version = store.rollup_version()
+    store.save(frame("negative"), "text:v2", "Statement", "watch", "ecb", DAY, supersedes=first)
+    assert totals(store) == {("ecb", "2025-09-18"): (1, 1, 0, -0.8)}
+    assert store.rollup_version() != version
+    # Superseded documents stay in the archive, and out of the rollups
+    assert len(store.list_documents()) == 2
+    assert store.backfill_rollups() == 0
+    assert totals(store) == {("ecb", "2025-09-18"): (1, 1, 0, -0.8)}
+
+
+def test_same_text_under_another_date_moves_its_rollup(tmp_path):
+    store = ResultStore(str(tmp_path))
+    store.save(frame("positive"), "text:a", "A", "text", "ecb", DAY)
+    store.save(frame("positive"), "text:a", "A", "text", "ecb", DAY + datetime.timedelta(days=1))
+    assert totals(store) == {("ecb", "2025-09-19"): (1, 1, 1, 0.8)}
+    # The same date again is not archived twice
+    store.save(frame("positive"), "text:a", "A", "text", "ecb", DAY + datetime.timedelta(days=1))
+    assert totals(store) == {("ecb", "2025-09-19"): (1, 1, 1, 0.8)}
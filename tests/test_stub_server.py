@@ -0,0 +1,28 @@
+import time
+
+import requests
+
+from benchmarks.stub_server import score_text, start_stub_server
+
+
+def test_job_runs_to_a_result():
+    server = start_stub_server(job_seconds=0.1)
+    try:
+        job_id = requests.post(f"{server.url}/jobs", json={"url": "https://example.org/a"}, timeout=5).json()["job_id"]
+        deadline = time.monotonic() + 5
+        status = {}
+        while status.get("status") != "done" and time.monotonic() < deadline:
+            status = requests.get(f"{server.url}/jobs/{job_id}", params={"wait": 1}, timeout=5).json()
+        assert status["status"] == "done"
+        rows = requests.get(f"{server.url}/jobs/{job_id}/result", timeout=5).json()
+        assert rows == score_text(server.page_text("https://example.org/a"))
+    finally:
+        server.shutdown()
+
+
+def test_unknown_job_is_not_found():
+    server = start_stub_server()
+    try:
+        assert requests.get(f"{server.url}/jobs/deadbeef", timeout=5).status_code == 404
+    finally:
+        server.shutdown()